@@ -0,0 +1,334 @@
+from math import floor
+
+import numpy
+
+from .voting_engines import DirectElectionEngine
+
+
+# Candidate interning
+class CandidateRegistry():
+    """
+    This class interns candidate names to dense integer IDs, in the order they are first seen.
+    The IDs are used as positions in the tally and redistribution arrays.
+    """
+
+    # Initialisation routine
+    def __init__(self, candidates = ()):
+        """
+        This method creates a registry, interning any candidates given.
+
+        Optional Parameters
+        ------
+        candidates: list <candidate obj>
+            The candidates to intern.
+        """
+        self.names = []
+        self.ids = {}
+        self.extend(candidates)
+
+
+    # Interning
+    def intern(self, candidate):
+        """This method returns the ID for a candidate, assigning the next free ID if they are new."""
+        if candidate not in self.ids:
+            self.ids[candidate] = len(self.names)
+            self.names.append(candidate)
+        return self.ids[candidate]
+
+    def extend(self, candidates):
+        """This method interns several candidates."""
+        for candidate in candidates:
+            self.intern(candidate)
+
+
+    # Set-like behaviour
+    def __contains__(self, candidate):
+        return candidate in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+
+
+# Redistribution array builder
+def build_matrix_arrays(index, matrix):
+    """
+    This function converts a redistribution matrix dictionary into arrays over the given candidate index.
+    It returns the candidate-by-candidate weights, the weights redistributed to 'None', and a flag for each candidate that has a matrix row.
+    """
+    positions = CandidateRegistry(index).ids
+    weights = numpy.zeros((len(index), len(index)))
+    to_none = numpy.zeros(len(index))
+    has_row = numpy.zeros(len(index), dtype = bool)
+    for from_key, row in matrix.items():
+        has_row[positions[from_key]] = True
+        for to_key, weight in row.items():
+            if to_key is None:
+                to_none[positions[from_key]] = weight
+            else:
+                weights[positions[from_key], positions[to_key]] = weight
+    return weights, to_none, has_row
+
+
+
+# Array-backed election engine
+class ArrayElectionEngine(DirectElectionEngine):
+    """
+    This class runs the same direct elections as DirectElectionEngine, but keeps the tallies in a NumPy array indexed by candidate.
+    The redistribution matrix is held as a dense candidate-by-candidate array with a separate column for votes redistributed to 'None', so each transfer is a single vectorised row operation.
+    Candidates are indexed in the order of the first-round votes (followed by any candidates without votes), so ties are broken in the same way as DirectElectionEngine.
+    The votes for each round are kept as arrays, with NaN entries for candidates no longer in the count; round_votes() converts a round back into a dictionary.
+    The count options of DirectElectionEngine are not implemented here, so each can only take the value listed in 'fixed_options'.
+    """
+
+    # Count options, with the only value the array count supports
+    fixed_options = {'history': 'full', 'arithmetic': 'float', 'bulk_exclusion': False, 'last_seat_shortcut': False, 'surplus': 'inclusive'}
+
+
+    # Initialisation routine
+    def __init__(self, candidates, seats = 1, votes = [], redistribution_matrix = {}, **options):
+        """
+        This method creates an election engine in the same way as DirectElectionEngine.
+        A ValueError is raised if a count option is given a value the array count does not support, rather than ignoring it.
+        """
+        for option, value in self.fixed_options.items():
+            if options.get(option, value) != value:
+                raise ValueError('Option not supported by ArrayElectionEngine: {} = "{}"'.format(option, options[option]))
+        super().__init__(candidates, seats, votes, redistribution_matrix, **options)
+
+
+    # Vote initialisation
+    def add_votes(self, votes):
+        """
+        This method processes the initial votes and calculates the voting quota using the Droop method.
+        The tally arrays are built when the election is run.
+        """
+        candidates = set(self.candidates)
+        for key in votes:
+            if not key in candidates:
+                raise ValueError('Write-in candidates are not supported')
+        self.first_votes = votes
+        self.quota = floor(sum(votes.values())/(self.seats+1))+1
+        self.tallies = None
+
+
+    # Redistribution matrix initialisation
+    def add_redistribution_matrix(self, matrix):
+        """This method checks the redistribution matrix in the same way as DirectElectionEngine, and marks the arrays for rebuilding."""
+        super().add_redistribution_matrix(matrix)
+        self.tallies = None
+
+
+    # Array preparation
+    def prepare_arrays(self):
+        """
+        This method maps candidates to integer indices and builds the tally, standing and redistribution arrays.
+        It is called automatically by single_voting_round() whenever the votes or matrix have changed.
+        """
+
+        # Index candidates
+        registry = CandidateRegistry(self.first_votes)
+        registry.extend(self.candidates)
+        self.index = registry.names
+        positions = registry.ids
+
+        # Build tallies
+        self.tallies = numpy.zeros(len(self.index))
+        self.standing = numpy.zeros(len(self.index), dtype = bool)
+        for candidate, votes in self.first_votes.items():
+            self.tallies[positions[candidate]] = votes
+            self.standing[positions[candidate]] = True
+        self.votes = [numpy.where(self.standing, self.tallies, numpy.nan)]
+
+        # Build redistribution arrays
+        self.matrix, self.to_none, self.has_row = build_matrix_arrays(self.index, self.redistribution_matrix)
+
+
+    # Single voting round method
+    def single_voting_round(self):
+        """This method performs a single round of voting, following the same steps as DirectElectionEngine.single_voting_round()."""
+
+        # Build arrays on first use
+        if self.tallies is None:
+            self.prepare_arrays()
+
+        # Winners by default
+        if self.seats - len(self.elected) >= self.standing.sum():
+            self.elected.extend(self.index[i] for i in numpy.flatnonzero(self.standing))
+            return True
+
+        # Elect winner
+        winner = self.find_winner()
+        if winner is not None:
+            self.elected.append(self.index[winner])
+            if self.seats == len(self.elected):
+                return True
+            self.redistribute_votes(
+                winner,
+                votes_to_share = self.tallies[winner] - self.quota
+            )
+            return False
+
+        # Eliminate loser
+        loser = self.find_loser()
+        self.eliminated.append(self.index[loser])
+        self.redistribute_votes(loser)
+
+
+    # Find winner method
+    def find_winner(self):
+        """This method returns the index of the standing candidate with the most votes, provided they meet the quota, or None otherwise."""
+        winner = numpy.argmax(numpy.where(self.standing, self.tallies, -numpy.inf))
+        return winner if self.tallies[winner] >= self.quota else None
+
+
+    # Find loser method
+    def find_loser(self):
+        """This method returns the index of the standing candidate with the fewest votes."""
+        return numpy.argmin(numpy.where(self.standing, self.tallies, numpy.inf))
+
+
+    # Redistribute votes method
+    def redistribute_votes(self, index_to_go, votes_to_share = False):
+        """
+        This method removes a candidate (by index) from the count and redistributes their votes amongst the standing candidates with one vectorised row operation.
+        As with DirectElectionEngine, all their votes are distributed unless 'votes_to_share' is given, and votes redistributed to 'None' are removed from the election.
+        """
+
+        # Advance voting round
+        votes_to_go = self.tallies[index_to_go]
+        self.standing[index_to_go] = False
+        self.tallies[index_to_go] = 0
+
+        # Redistribute votes
+        if self.has_row[index_to_go]:
+            weights = self.matrix[index_to_go] * self.standing
+            total_weight = weights.sum() + self.to_none[index_to_go]
+            if total_weight:
+                self.tallies += (votes_to_share if votes_to_share else votes_to_go) * weights/total_weight
+
+        # Record round
+        self.votes.append(numpy.where(self.standing, self.tallies, numpy.nan))
+
+
+    # Round conversion
+    def round_votes(self, round_index):
+        """This method returns the votes for a single round as a dictionary of the candidates still in the count."""
+        return {
+            self.index[i]: self.votes[round_index][i].item()
+            for i in numpy.flatnonzero(~numpy.isnan(self.votes[round_index]))
+        }
+
+
+
+# Batched election engine
+class BatchElectionEngine():
+    """
+    This class counts many variants ("scenarios") of the same election at once, such as the same group under different redistribution weights.
+    The first-round votes are a scenarios-by-candidates array and each scenario can have its own redistribution matrix, so every voting round is a handful of vectorised operations across all scenarios.
+    Each scenario follows the same rules as DirectElectionEngine, with ties broken in favour of the candidate listed first.
+    """
+
+    # Initialisation routine
+    def __init__(self, candidates, seats, votes, redistribution_matrices, to_none = None):
+        """
+        This method creates a batch of elections from stacked arrays.
+
+        Required Parameters
+        ------
+        candidates: list <candidate obj>
+            The list of candidates standing, in the column order of the arrays.
+        seats: int
+            The number of seats to be elected in every scenario.
+        votes: array <scenario, candidate>
+            The first-round votes for each candidate in each scenario. Candidates not standing in a scenario are marked with NaN.
+        redistribution_matrices: array <scenario, from-candidate, to-candidate>
+            The redistribution weights for each scenario. A single candidate-by-candidate array is shared by all scenarios.
+
+        Optional Parameters
+        ------
+        to_none: array <scenario, from-candidate>
+            The weights redistributed to 'None' for each scenario. A single array is shared by all scenarios.
+        """
+
+        # Read inputs
+        self.candidates = candidates
+        self.seats = seats
+        self.votes = numpy.array(votes, dtype = float, ndmin = 2)
+        scenarios = self.votes.shape[0]
+        if self.votes.shape[1] != len(candidates):
+            raise ValueError('Votes must have one column per candidate')
+        self.matrices = numpy.broadcast_to(redistribution_matrices, (scenarios, len(candidates), len(candidates)))
+        self.to_none = numpy.broadcast_to(0 if to_none is None else to_none, (scenarios, len(candidates)))
+
+        # Calculate quotas using the Droop method
+        self.quota = numpy.floor(numpy.nansum(self.votes, axis = 1)/(self.seats+1))+1
+
+        # Prepare output containers
+        self.elected = numpy.full(self.votes.shape, -1)
+        self.eliminated = numpy.full(self.votes.shape, -1)
+
+
+    # Main routine
+    def run_election(self):
+        """
+        This method is the main election routine.
+        Each pass through the loop is one voting round for every scenario that is still counting.
+        """
+
+        # Prepare count state
+        scenarios = numpy.arange(self.votes.shape[0])
+        standing = ~numpy.isnan(self.votes)
+        tallies = numpy.where(standing, self.votes, 0)
+        elected_count = numpy.zeros(len(scenarios), dtype = int)
+        counting = numpy.ones(len(scenarios), dtype = bool)
+
+        # Loop over voting rounds
+        for i in range(len(self.candidates)):
+            if not counting.any():
+                break
+
+            # Winners by default
+            default = counting & (self.seats - elected_count >= standing.sum(axis = 1))
+            if default.any():
+                rows, columns = numpy.nonzero(standing & default[:, None])
+                self.elected[rows, columns] = i
+                counting &= ~default
+
+            # Find winners and losers
+            winner = numpy.argmax(numpy.where(standing, tallies, -numpy.inf), axis = 1)
+            loser = numpy.argmin(numpy.where(standing, tallies, numpy.inf), axis = 1)
+            has_winner = counting & (tallies[scenarios, winner] >= self.quota)
+            has_loser = counting & ~has_winner
+
+            # Elect winners
+            self.elected[has_winner, winner[has_winner]] = i
+            elected_count += has_winner
+            counting &= ~(has_winner & (elected_count == self.seats))
+            has_winner &= counting
+
+            # Eliminate losers
+            self.eliminated[has_loser, loser[has_loser]] = i
+
+            # Redistribute votes
+            moving = has_winner | has_loser
+            leaving = numpy.where(has_winner, winner, loser)[moving]
+            votes_to_go = tallies[moving, leaving]
+            votes_to_share = numpy.where(has_winner[moving], votes_to_go - self.quota[moving], 0)
+            votes_to_share = numpy.where(votes_to_share != 0, votes_to_share, votes_to_go)
+            standing[moving, leaving] = False
+            tallies[moving, leaving] = 0
+            weights = self.matrices[moving, leaving] * standing[moving]
+            total_weight = weights.sum(axis = 1) + self.to_none[moving, leaving]
+            shares = numpy.divide(votes_to_share, total_weight, out = numpy.zeros(len(leaving)), where = total_weight != 0)
+            tallies[moving] += weights * shares[:, None]
+
+
+    # Results output
+    def elected_sets(self):
+        """This method returns the candidates elected in each scenario, in the order they were elected."""
+        elected_sets = []
+        for rounds in self.elected:
+            columns = numpy.flatnonzero(rounds >= 0)
+            elected_sets.append([self.candidates[j] for j in columns[numpy.argsort(rounds[columns], kind = 'stable')]])
+        return elected_sets
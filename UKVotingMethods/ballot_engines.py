@@ -0,0 +1,232 @@
+from .voting_engines import DirectElectionEngine
+
+
+# Ranked ballot store
+class BallotTrie():
+    """
+    This class stores ranked ballots as a prefix tree, so that identical ballots are held once with a combined weight and ballots sharing their first preferences share nodes.
+    The tree is held in flat lists indexed by node number, with node 0 as the root:
+        'candidate' is the preference a node adds to its parent's ballot prefix,
+        'parent', 'first_child' and 'next_sibling' link the nodes (-1 where there is no link),
+        'total' is the weight of every ballot passing through a node, and 'ending' the weight of ballots with no further preferences.
+    Since each node's subtree holds every ballot with that prefix, a count can move a whole subtree of ballots in one step.
+    """
+
+    # Initialisation routine
+    def __init__(self, ballots = ()):
+        """
+        This method creates a ballot store, optionally adding ballots to it.
+
+        Optional Parameters
+        ------
+        ballots: iterable <(tuple <candidate>, int)>
+            The ballots to add, as (preferences, weight) pairs.
+        """
+        self.candidate = [None]
+        self.parent = [-1]
+        self.first_child = [-1]
+        self.next_sibling = [-1]
+        self.total = [0]
+        self.ending = [0]
+        for preferences, weight in ballots:
+            self.add(preferences, weight)
+
+
+    # Ballot input
+    def add(self, preferences, weight = 1):
+        """
+        This method adds a ballot, listing candidates from first to last preference.
+        A candidate may only appear once on a ballot, and a ballot with no preferences is ignored.
+        """
+        if len(set(preferences)) != len(preferences):
+            raise ValueError('Candidates may only be ranked once on a ballot')
+        if not preferences:
+            return
+
+        # Walk and extend prefix nodes
+        node = 0
+        self.total[0] += weight
+        for candidate in preferences:
+            child = self.first_child[node]
+            while child != -1 and self.candidate[child] != candidate:
+                child = self.next_sibling[child]
+            if child == -1:
+                child = len(self.candidate)
+                self.candidate.append(candidate)
+                self.parent.append(node)
+                self.first_child.append(-1)
+                self.next_sibling.append(self.first_child[node])
+                self.total.append(0)
+                self.ending.append(0)
+                self.first_child[node] = child
+            node = child
+            self.total[node] += weight
+        self.ending[node] += weight
+
+
+    # Tree traversal
+    def children(self, node):
+        """This method yields the child nodes of a node."""
+        child = self.first_child[node]
+        while child != -1:
+            yield child
+            child = self.next_sibling[child]
+
+    def preferences(self, node):
+        """This method returns the ballot prefix ending at a node."""
+        preferences = []
+        while node > 0:
+            preferences.append(self.candidate[node])
+            node = self.parent[node]
+        return tuple(reversed(preferences))
+
+
+    # Ballot output
+    def ballots(self):
+        """This method returns the distinct ballots and their weights, as (preferences, weight) pairs."""
+        return [(self.preferences(node), self.ending[node]) for node in range(1, len(self.ending)) if self.ending[node]]
+
+    def first_preferences(self):
+        """This method returns the total weight of first-preference votes for each candidate."""
+        return {self.candidate[node]: self.total[node] for node in self.children(0)}
+
+    def candidates(self):
+        """This method returns the set of candidates ranked on any ballot."""
+        return set(self.candidate[1:])
+
+    def __len__(self):
+        """This method returns the number of distinct ballots."""
+        return sum(1 for weight in self.ending[1:] if weight)
+
+
+
+# Synthetic ballot generator
+def ballots_from_matrix(votes, matrix, max_depth = None, min_weight = 0):
+    """
+    This function builds ranked ballots that express a redistribution matrix, for checking BallotElectionEngine against DirectElectionEngine.
+    Each candidate's first-preference votes are split across next preferences in proportion to the candidate's matrix row, leaving out candidates already ranked, with any weight given to 'None' ending the ballot.
+    Ballots are extended until the row is exhausted, 'max_depth' preferences are reached or their weight falls below 'min_weight'.
+    A BallotTrie of (possibly fractional) ballot weights is returned.
+    """
+    trie = BallotTrie()
+
+    # Extend ballots one preference at a time
+    stack = [((candidate,), weight) for candidate, weight in reversed(list(votes.items())) if weight]
+    while stack:
+        preferences, weight = stack.pop()
+        row = matrix.get(preferences[-1], {})
+        options = [(candidate, row[candidate]) for candidate in row if candidate is not None and candidate not in preferences and row[candidate]]
+        total_weight = sum(option_weight for _, option_weight in options) + row.get(None, 0)
+        if not options or (max_depth and len(preferences) >= max_depth):
+            trie.add(preferences, weight)
+            continue
+
+        # Ballots ending here
+        if row.get(None):
+            trie.add(preferences, weight * row[None]/total_weight)
+
+        # Ballots continuing to each option
+        for candidate, option_weight in reversed(options):
+            share = weight * option_weight/total_weight
+            if share < min_weight:
+                trie.add(preferences + (candidate,), share)
+            else:
+                stack.append((preferences + (candidate,), share))
+
+    return trie
+
+
+
+# Ranked ballot election engine
+class BallotElectionEngine(DirectElectionEngine):
+    """
+    This class counts elections from ranked ballots, rather than from a redistribution matrix.
+    The count follows the same rules as DirectElectionEngine (Droop quota, candidates elected or excluded one per round, ties broken in favour of the candidate listed first),
+    but a departing candidate's votes follow the next continuing preference on each ballot.
+    Surpluses are transferred from all of the elected candidate's ballots at a reduced transfer value (the inclusive Gregory method).
+    Each candidate holds a pile of ballot tree nodes with the votes they carry, so a transfer only visits the subtrees of the departing candidate's ballots.
+    """
+
+    # Initialisation routine
+    def __init__(self, candidates, seats = 1, ballots = None, **options):
+        """
+        This method creates an election engine from the list of candidates, the number of seats and the ballots cast.
+
+        Required Parameters
+        ------
+        candidates: list <candidate obj>
+            The list of candidates standing.
+
+        Optional Parameters
+        ------
+        seats: int (default = 1)
+            The number of seats to be elected.
+        ballots: BallotTrie or iterable <(tuple <candidate>, int)>
+            The ballots cast, as a BallotTrie or (preferences, weight) pairs.
+        history, arithmetic, bulk_exclusion, last_seat_shortcut:
+            As for DirectElectionEngine.
+        surplus: str (default = 'inclusive')
+            Only 'inclusive' is supported, since surpluses are always transferred from all of the elected candidate's ballots. Any other method raises a ValueError.
+        """
+        if options.get('surplus', 'inclusive') != 'inclusive':
+            raise ValueError('Surplus method not supported by BallotElectionEngine: "{}"'.format(options['surplus']))
+        super().__init__(candidates, seats, **options)
+        self.ballots = None
+        if ballots is not None:
+            self.add_ballots(ballots)
+
+
+    # Ballot initialisation
+    def add_ballots(self, ballots):
+        """
+        This method checks that only valid candidates are ranked, then sets up the first-round votes and each candidate's pile of ballots.
+        Every candidate stands in the first round, including those with no first preferences.
+        """
+        if not isinstance(ballots, BallotTrie):
+            ballots = BallotTrie(ballots)
+        candidates = set(self.candidates)
+        for candidate in ballots.candidates():
+            if not candidate in candidates:
+                raise ValueError('Write-in candidates are not supported')
+
+        # Set up first-round votes and piles
+        self.ballots = ballots
+        first_preferences = ballots.first_preferences()
+        self.add_votes({candidate: first_preferences.get(candidate, 0) for candidate in self.candidates})
+        self.node_weights = [self.arithmetic.weight(total) for total in ballots.total]
+        self.piles = {candidate: [] for candidate in self.candidates}
+        for node in ballots.children(0):
+            self.piles[ballots.candidate[node]].append((node, self.arithmetic.votes(ballots.total[node])))
+
+
+    # Transfer votes method
+    def transfer_votes(self, candidate_to_go, votes_to_go, votes_to_share, round_votes):
+        """
+        This method moves each ballot in the departing candidate's pile to its next continuing preference, carrying 'votes_to_share' out of the 'votes_to_go' it held.
+        Ballots with no continuing preference are exhausted.
+        It returns the candidates whose votes were changed.
+        """
+        pile, self.piles[candidate_to_go] = self.piles[candidate_to_go], []
+        if not votes_to_go:
+            return []
+
+        # Find next continuing preferences
+        moved = {}
+        stack = pile
+        while stack:
+            node, carried = stack.pop()
+            for child in self.ballots.children(node):
+                child_carried = self.arithmetic.transfer(carried, self.node_weights[child], self.node_weights[node])
+                candidate = self.ballots.candidate[child]
+                if candidate in round_votes:
+                    moved.setdefault(candidate, []).append((child, child_carried))
+                else:
+                    stack.append((child, child_carried))
+
+        # Transfer ballots at the transfer value
+        for candidate, entries in moved.items():
+            for child, child_carried in entries:
+                share = self.arithmetic.transfer(votes_to_share, child_carried, votes_to_go)
+                self.piles[candidate].append((child, share))
+                round_votes[candidate] += share
+        return list(moved)
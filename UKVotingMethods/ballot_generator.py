@@ -0,0 +1,164 @@
+import struct
+
+import numpy
+
+
+# Ballot file layout
+MAGIC = b'UKVB1\n'
+CHUNK_HEADER = struct.Struct('<IQ')
+
+
+# Synthetic ballot stream
+def generate_ballots(votes, matrix, seed = None, max_depth = None):
+    """
+    This function generates random ranked ballots from first-preference votes and a redistribution matrix, yielding them as (preferences, count) pairs.
+    Each candidate's first-preference votes are split at random between next preferences in proportion to their matrix row, leaving out candidates already ranked,
+    with any weight given to 'None' ending the ballot, until the row is exhausted or 'max_depth' preferences are reached.
+    The votes are split with multinomial draws, so identical ballots come out as a single pair and the work grows with the number of distinct ballots rather than the number of votes.
+    Only the ballots still being extended are held in memory, so tens of millions of votes can be streamed.
+
+    Required Parameters
+    ------
+    votes: dict <candidate: int>
+        The first-round votes for each candidate.
+    matrix: dict <candidate: dict <candidate: int> >
+        The redistribution matrix, such as RedistributionIndex.candidate_matrix() builds from data/parties.json.
+
+    Optional Parameters
+    ------
+    seed: int
+        The seed for the random number generator, for repeatable ballots.
+    max_depth: int
+        The largest number of preferences on a ballot.
+    """
+    rng = numpy.random.default_rng(seed)
+
+    # Extend ballots one preference at a time
+    stack = [((candidate,), int(count)) for candidate, count in reversed(list(votes.items())) if count]
+    while stack:
+        preferences, count = stack.pop()
+        row = matrix.get(preferences[-1], {})
+        options = [candidate for candidate in row if candidate is not None and candidate not in preferences and row[candidate]]
+        if not options or (max_depth and len(preferences) >= max_depth):
+            yield preferences, count
+            continue
+
+        # Split votes between ending here and each option
+        weights = numpy.array([row.get(None, 0)] + [row[candidate] for candidate in options], dtype = float)
+        counts = rng.multinomial(count, weights/weights.sum())
+        if counts[0]:
+            yield preferences, int(counts[0])
+        for candidate, option_count in zip(reversed(options), reversed(counts[1:])):
+            if option_count:
+                stack.append((preferences + (candidate,), int(option_count)))
+
+
+
+# Chunked ballot file writer
+class BallotWriter():
+    """
+    This class writes (preferences, count) ballots to a binary file in fixed-size chunks, so ballots can be streamed to disk without being held in memory.
+    The file starts with a header listing the candidates, followed by chunks each holding three arrays:
+    the ballot counts (uint32), the number of preferences on each ballot (uint8) and every ballot's preferences run together as candidate positions (uint16).
+    """
+
+    # Initialisation routine
+    def __init__(self, path, candidates, chunk_size = 100000):
+        """
+        This method opens a ballot file for writing and writes the candidate header.
+
+        Required Parameters
+        ------
+        path: str
+            The ballot file.
+        candidates: list <str>
+            The candidates who may appear on the ballots.
+
+        Optional Parameters
+        ------
+        chunk_size: int (default = 100000)
+            The number of distinct ballots written per chunk.
+        """
+        self.position = {candidate: i for i, candidate in enumerate(candidates)}
+        self.chunk_size = chunk_size
+        self.counts, self.lengths, self.preferences = [], [], []
+        self.ballots = 0
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.file.write(struct.pack('<I', len(candidates)))
+        for candidate in candidates:
+            name = candidate.encode('utf-8')
+            self.file.write(struct.pack('<H', len(name)) + name)
+
+
+    # Ballot writing
+    def write(self, preferences, count = 1):
+        """This method adds a ballot, writing out a chunk once 'chunk_size' ballots are waiting."""
+        self.counts.append(count)
+        self.lengths.append(len(preferences))
+        self.preferences.extend(self.position[candidate] for candidate in preferences)
+        self.ballots += count
+        if len(self.counts) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """This method writes out any waiting ballots as a chunk."""
+        if not self.counts:
+            return
+        self.file.write(CHUNK_HEADER.pack(len(self.counts), len(self.preferences)))
+        self.file.write(numpy.array(self.counts, dtype = '<u4').tobytes())
+        self.file.write(numpy.array(self.lengths, dtype = 'u1').tobytes())
+        self.file.write(numpy.array(self.preferences, dtype = '<u2').tobytes())
+        self.counts, self.lengths, self.preferences = [], [], []
+
+
+    # Closing
+    def close(self):
+        """This method writes out any waiting ballots and closes the file."""
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+
+# Ballot file reader
+def read_ballot_chunks(path):
+    """
+    This function reads a ballot file one chunk at a time.
+    The candidate list is yielded first, followed by a (counts, lengths, preferences) tuple of arrays for each chunk.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a ballot file: "{}"'.format(path))
+        candidates = []
+        for i in range(struct.unpack('<I', file.read(4))[0]):
+            length = struct.unpack('<H', file.read(2))[0]
+            candidates.append(file.read(length).decode('utf-8'))
+        yield candidates
+
+        # Read chunks
+        while True:
+            header = file.read(CHUNK_HEADER.size)
+            if not header:
+                break
+            rows, preferences = CHUNK_HEADER.unpack(header)
+            yield (
+                numpy.frombuffer(file.read(4 * rows), dtype = '<u4'),
+                numpy.frombuffer(file.read(rows), dtype = 'u1'),
+                numpy.frombuffer(file.read(2 * preferences), dtype = '<u2')
+            )
+
+
+def read_ballots(path):
+    """This function streams the ballots in a ballot file as (preferences, count) pairs, ready for BallotTrie or BallotElectionEngine."""
+    chunks = read_ballot_chunks(path)
+    candidates = next(chunks)
+    for counts, lengths, preferences in chunks:
+        ends = numpy.cumsum(lengths)
+        for count, start, end in zip(counts.tolist(), (ends - lengths).tolist(), ends.tolist()):
+            yield tuple(candidates[i] for i in preferences[start:end].tolist()), count
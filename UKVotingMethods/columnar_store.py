@@ -0,0 +1,180 @@
+import os
+import re
+
+import numpy
+
+from .records import Candidate, ConstituencyResult
+
+
+# Column file writer
+def save_column(path, array):
+    """This function saves an array as a .npy file, writing it under a temporary name first so open memory maps of the old file are never truncated."""
+    with open(path + '.tmp', 'wb') as file:
+        numpy.save(file, array)
+    os.replace(path + '.tmp', path)
+
+
+# Columnar store writer
+def write_columnar_store(directory, elections):
+    """
+    This function writes the results of one or more elections to a columnar store directory.
+    Every election has one row per candidate, in constituency order, split across fixed-width columns saved as .npy files:
+    the candidate name, party and constituency as positions in a shared string table, and the votes as 64-bit integers.
+    An offsets column marks where each constituency's rows start and end.
+    The string table is a single UTF-8 byte array with its own offsets, shared by all elections so that names standing in several elections are stored once.
+
+    Required Parameters
+    ------
+    directory: str
+        The store directory. It is created if it does not exist, and any election already in it with the same year is overwritten.
+    elections: dict <year: dict <constituency name: ConstituencyResult>>
+        The results for each election, as returned by load_results() or ResultsStore.load().
+    """
+    os.makedirs(directory, exist_ok = True)
+
+    # Build string table, keeping any strings already stored
+    strings = ColumnarStore(directory).strings() if os.path.exists(os.path.join(directory, 'strings.npy')) else []
+    positions = {string: i for i, string in enumerate(strings)}
+    def intern(string):
+        if string not in positions:
+            positions[string] = len(strings)
+            strings.append(string)
+        return positions[string]
+
+    # Build columns for each election
+    columns = {}
+    for year, results in elections.items():
+        offsets = [0]
+        constituency, names, parties, votes = [], [], [], []
+        for name, result in results.items():
+            constituency.append(intern(name))
+            for candidate in result.candidates:
+                names.append(intern(candidate.name))
+                parties.append(intern(candidate.party))
+                votes.append(candidate.votes)
+            offsets.append(len(votes))
+        columns[year] = {
+            'offsets': numpy.array(offsets, dtype = numpy.int64),
+            'constituency': numpy.array(constituency, dtype = numpy.int32),
+            'name': numpy.array(names, dtype = numpy.int32),
+            'party': numpy.array(parties, dtype = numpy.int32),
+            'votes': numpy.array(votes, dtype = numpy.int64)
+        }
+
+    # Write string table
+    encoded = [string.encode('utf-8') for string in strings]
+    string_offsets = numpy.zeros(len(encoded)+1, dtype = numpy.int64)
+    string_offsets[1:] = numpy.cumsum([len(string) for string in encoded])
+    save_column(os.path.join(directory, 'strings.npy'), numpy.frombuffer(b''.join(encoded), dtype = numpy.uint8))
+    save_column(os.path.join(directory, 'string_offsets.npy'), string_offsets)
+
+    # Write columns
+    for year, year_columns in columns.items():
+        for column, array in year_columns.items():
+            save_column(os.path.join(directory, '{}.{}.npy'.format(year, column)), array)
+
+
+
+# Columnar store reader
+class ColumnarStore():
+    """
+    This class opens a columnar store written by write_columnar_store().
+    Every column is memory-mapped rather than read, so opening a store costs almost nothing and only the pages of the columns that are used are loaded from disk.
+    """
+
+    # Initialisation routine
+    def __init__(self, directory):
+        """
+        This method memory-maps the string table of a columnar store.
+
+        Required Parameters
+        ------
+        directory: str
+            The store directory.
+        """
+        self.directory = directory
+        self.string_bytes = numpy.load(os.path.join(directory, 'strings.npy'), mmap_mode = 'r')
+        self.string_offsets = numpy.load(os.path.join(directory, 'string_offsets.npy'), mmap_mode = 'r')
+        self.decoded = {}
+
+
+    # String table
+    def string(self, position):
+        """This method returns a string from the string table, decoding it on first use."""
+        position = int(position)
+        if position not in self.decoded:
+            start, end = self.string_offsets[position], self.string_offsets[position+1]
+            self.decoded[position] = self.string_bytes[start:end].tobytes().decode('utf-8')
+        return self.decoded[position]
+
+    def strings(self):
+        """This method returns the whole string table as a list."""
+        return [self.string(i) for i in range(len(self.string_offsets)-1)]
+
+
+    # Elections
+    def years(self):
+        """This method returns the years of the elections held in the store."""
+        return sorted(int(match.group(1)) for match in (re.match(r'(\d+)\.votes\.npy$', name) for name in os.listdir(self.directory)) if match)
+
+    def election(self, year):
+        """This method returns a ColumnarElection for the given year, raising a KeyError if it is not in the store."""
+        if year not in self.years():
+            raise KeyError(year)
+        return ColumnarElection(self, year)
+
+
+
+# Single election in a columnar store
+class ColumnarElection():
+    """
+    This class reads one election's columns from a ColumnarStore.
+    It offers the same names(), load() and item access as ResultsStore, so runners can read from either.
+    columns() returns a constituency's rows as slices of the memory-mapped arrays, without copying or building records.
+    """
+
+    # Initialisation routine
+    def __init__(self, store, year):
+        self.store = store
+        self.year = year
+        for column in ('offsets', 'constituency', 'name', 'party', 'votes'):
+            setattr(self, column, numpy.load(os.path.join(store.directory, '{}.{}.npy'.format(year, column)), mmap_mode = 'r'))
+        self.position = {store.string(constituency): i for i, constituency in enumerate(self.constituency)}
+
+
+    # Constituency names
+    def names(self):
+        """This method returns the constituency names in store order."""
+        return list(self.position)
+
+    def __contains__(self, name):
+        return name in self.position
+
+    def __len__(self):
+        return len(self.position)
+
+
+    # Column access
+    def columns(self, name):
+        """
+        This method returns a constituency's (name, party, votes) columns as memory-mapped array slices.
+        Names and parties are positions in the store's string table.
+        """
+        i = self.position[name]
+        start, end = self.offsets[i], self.offsets[i+1]
+        return self.name[start:end], self.party[start:end], self.votes[start:end]
+
+
+    # Record access
+    def __getitem__(self, name):
+        """This method returns a single constituency as a ConstituencyResult, raising a KeyError if it is not in the election."""
+        names, parties, votes = self.columns(name)
+        string = self.store.string
+        return ConstituencyResult(name, [
+            Candidate(string(candidate), string(party), int(tally)) for candidate, party, tally in zip(names, parties, votes)
+        ])
+
+    def load(self, names):
+        """This method reads a set of constituencies in store order, returning a dictionary of name to ConstituencyResult."""
+        names = sorted(set(names), key = self.position.__getitem__)
+        return {name: self[name] for name in names}
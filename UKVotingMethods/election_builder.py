@@ -0,0 +1,78 @@
+import re
+
+from .voting_engines import DirectElectionEngine
+
+
+# Constituency name matching
+def constituency_key(name):
+    """
+    This function reduces a constituency name to a key that matches across data sources.
+    The group list and the scraped results differ in the use of '&', commas and word order (e.g. "Chester, City of").
+    """
+    return tuple(sorted(re.sub('[,.]', '', name.lower().replace('&', 'and')).split()))
+
+
+# Party-level redistribution lookup
+class RedistributionIndex():
+    """
+    This class precompiles the 'redistribute' entries of the parties data into a lookup table indexed by party.
+    Candidate redistribution matrices are then built by grouping candidates by party, so each party's row is assembled once and shared by all of its candidates.
+    This keeps matrix construction proportional to parties x candidates rather than candidates x candidates.
+    """
+
+    # Initialisation routine
+    def __init__(self, parties):
+        """
+        This method compiles the lookup table.
+
+        Required Parameters
+        ------
+        parties: dict <party code: dict>
+            The parties data, as loaded from data/parties.json.
+        """
+        self.codes = [code for code in parties if 'redistribute' in parties[code]]
+        self.position = {code: i for i, code in enumerate(self.codes)}
+        self.table = [list(parties[code]['redistribute'].items()) for code in self.codes]
+
+
+    # Candidate matrix builder
+    def candidate_matrix(self, candidates):
+        """
+        This method returns the candidate redistribution matrix for a list of Candidate records.
+        Candidates from parties without a redistribution entry are left out, so their votes are dropped when they leave the count.
+        """
+
+        # Group candidates by party
+        by_party = {}
+        for candidate in candidates:
+            by_party.setdefault(candidate.party, []).append(candidate.name)
+
+        # Build one row per party
+        matrix = {}
+        for from_party, from_names in by_party.items():
+            if from_party not in self.position:
+                continue
+            row = {}
+            for to_party, weight in self.table[self.position[from_party]]:
+                for to_name in by_party.get(to_party, []):
+                    row[to_name] = weight
+            for from_name in from_names:
+                matrix[from_name] = row
+
+        return matrix
+
+
+
+# Election builder
+def build_election(candidates, seats, redistribution, engine = DirectElectionEngine, **options):
+    """
+    This function creates an election engine for a list of Candidate records, ready to run.
+    Any extra keyword arguments are passed on to the engine.
+    """
+    return engine(
+        [candidate.name for candidate in candidates],
+        seats = seats,
+        votes = {candidate.name: candidate.votes for candidate in candidates},
+        redistribution_matrix = redistribution.candidate_matrix(candidates),
+        **options
+    )
@@ -0,0 +1,151 @@
+from .voting_engines import TallyRanking
+
+
+# Highest averages divisors
+DIVISORS = {
+    'dhondt': lambda seats: seats + 1,
+    'sainte-lague': lambda seats: 2*seats + 1
+}
+
+
+# Party tallies
+def party_tallies(candidates):
+    """
+    This function adds up the votes of a list of Candidate records by party.
+    The parties are returned in order of votes (most first), which is the order ties are broken in.
+    """
+    tallies = {}
+    for candidate in candidates:
+        tallies[candidate.party] = tallies.get(candidate.party, 0) + candidate.votes
+    return dict(sorted(tallies.items(), key = lambda item: item[1], reverse = True))
+
+
+
+# Highest averages election engine
+class HighestAveragesEngine():
+    """
+    This class allocates seats between party lists by a highest averages method:
+        1. D'Hondt (divisors 1, 2, 3, ...)
+        2. Sainte-Laguë (divisors 1, 3, 5, ...)
+    Each party's current average is held in a TallyRanking, so each seat is a heap lookup and a single update rather than a recalculation of every party's average (O(S log P) for S seats and P parties).
+    Parties can start with seats already won (as in the Additional Member System), which lowers their first average.
+    Ties are broken in favour of the party with more votes.
+    """
+
+    # Initialisation routine
+    def __init__(self, votes, seats, method = 'dhondt', initial_seats = {}, threshold = 0):
+        """
+        This method creates an election engine from the votes for each party and the number of seats.
+
+        Required Parameters
+        ------
+        votes: dict <party: int>
+            The votes for each party.
+        seats: int
+            The number of seats to be allocated.
+
+        Optional Parameters
+        ------
+        method: str (default = 'dhondt')
+            The highest averages method: 'dhondt' or 'sainte-lague'.
+        initial_seats: dict <party: int>
+            Seats already won by each party, which count towards their divisors but not towards 'seats'.
+        threshold: float (default = 0)
+            The smallest share of the votes a party needs to win seats.
+        """
+        if method not in DIVISORS:
+            raise ValueError('Method not recognised: "{}"'.format(method))
+        self.divisor = DIVISORS[method]
+        self.seats = seats
+        total = sum(votes.values())
+        self.votes = dict(sorted(
+            ((party, party_votes) for party, party_votes in votes.items() if party_votes and party_votes >= threshold * total),
+            key = lambda item: item[1],
+            reverse = True
+        ))
+        self.initial_seats = initial_seats
+
+        # Prepare output containers
+        self.elected = []
+        self.allocation = {party: initial_seats.get(party, 0) for party in self.votes}
+
+
+    # Main routine
+    def run_election(self):
+        """
+        This method allocates the seats one at a time to the party with the highest average, recording each winning party in 'elected'.
+        The total seats held by each party (including any initial seats) are left in 'allocation'.
+        """
+        averages = {party: self.votes[party]/self.divisor(self.allocation[party]) for party in self.votes}
+        ranking = TallyRanking(averages)
+        for i in range(self.seats):
+            party, _ = ranking.leader()
+            if party is None:
+                break
+            self.elected.append(party)
+            self.allocation[party] += 1
+            averages[party] = self.votes[party]/self.divisor(self.allocation[party])
+            ranking.update(party)
+
+
+
+# Additional member system engine
+class AdditionalMemberEngine():
+    """
+    This class counts an Additional Member System election for one region.
+    Each constituency elects the candidate with the most votes, and the region's list seats are then allocated by D'Hondt (or Sainte-Laguë) with each party's constituency seats counted towards its divisor, so that the list seats top up parties towards a proportional share.
+    The list votes are taken to be each party's total constituency votes in the region.
+    """
+
+    # Initialisation routine
+    def __init__(self, constituencies, list_seats, method = 'dhondt', threshold = 0):
+        """
+        This method creates an election engine from the constituency results of a region.
+
+        Required Parameters
+        ------
+        constituencies: list <ConstituencyResult>
+            The constituency results in the region.
+        list_seats: int
+            The number of list seats for the region.
+
+        Optional Parameters
+        ------
+        method: str (default = 'dhondt')
+            The highest averages method used for the list seats.
+        threshold: float (default = 0)
+            The smallest share of the regional vote a party needs to win list seats.
+        """
+        self.constituencies = constituencies
+        self.list_seats = list_seats
+        self.method = method
+        self.threshold = threshold
+
+        # Prepare output containers
+        self.constituency_winners = {}
+        self.list_engine = None
+        self.allocation = {}
+
+
+    # Main routine
+    def run_election(self):
+        """
+        This method elects the constituency winners (recorded in 'constituency_winners'), then allocates the list seats.
+        The total seats won by each party are left in 'allocation'.
+        """
+
+        # Elect constituency members
+        constituency_seats = {}
+        candidates = []
+        for constituency in self.constituencies:
+            winner, _ = TallyRanking({i: candidate.votes for i, candidate in enumerate(constituency.candidates)}).leader()
+            winner = constituency.candidates[winner]
+            self.constituency_winners[constituency.name] = winner
+            constituency_seats[winner.party] = constituency_seats.get(winner.party, 0) + 1
+            candidates.extend(constituency.candidates)
+
+        # Allocate list seats
+        self.list_engine = HighestAveragesEngine(party_tallies(candidates), self.list_seats, self.method, constituency_seats, self.threshold)
+        self.list_engine.run_election()
+        self.allocation = dict(constituency_seats)
+        self.allocation.update(self.list_engine.allocation)
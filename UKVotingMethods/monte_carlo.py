@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from .array_engines import BatchElectionEngine
+
+
+# Redistribution prior builder
+def spread_priors(parties, concentration = 20, spread = 0.5):
+    """
+    This function builds Dirichlet priors around the point estimates in the parties data.
+    Each party's 'redistribute' weights are scaled by 'concentration' (higher values keep samples closer to the point estimate),
+    and every other party with redistribution weights, as well as 'None' (votes leaving the count), gets a further 'spread' so that it receives an occasional share.
+    A dictionary of party code to a {target party code or None: alpha} dictionary is returned, ready for RedistributionSampler.
+    """
+    codes = [code for code in parties if 'redistribute' in parties[code]]
+    priors = {}
+    for code in codes:
+        weights = parties[code]['redistribute']
+        total = sum(weights.values())
+        priors[code] = {target: spread for target in codes + [None]}
+        for target, weight in weights.items():
+            priors[code][target] += concentration * weight/total
+    return priors
+
+
+
+# Redistribution weight sampler
+class RedistributionSampler():
+    """
+    This class draws party-level redistribution weights for Monte Carlo counts.
+    Parties with a prior have their weights drawn from a Dirichlet distribution, so each sample sums to one across the receiving parties and 'None'.
+    Parties without a prior keep the point estimate from the parties data, and parties without any 'redistribute' entry have their votes dropped, as in the deterministic count.
+    """
+
+    # Initialisation routine
+    def __init__(self, parties, priors = {}, seed = None):
+        """
+        This method prepares the sampler.
+
+        Required Parameters
+        ------
+        parties: dict <party code: dict>
+            The parties data, as loaded from data/parties.json.
+
+        Optional Parameters
+        ------
+        priors: dict <party code: dict <target party code or None: alpha>>
+            The Dirichlet concentration parameters for each party's redistribution weights. See spread_priors().
+        seed: int
+            The seed for the random number generator, for repeatable runs.
+        """
+        self.codes = list(parties)
+        self.position = {code: i for i, code in enumerate(self.codes)}
+        self.priors = priors
+        self.rng = numpy.random.default_rng(seed)
+
+        # Point estimates, with one extra row and column of zeros for parties not in the data and a final column for 'None'
+        self.point = numpy.zeros((len(self.codes)+1, len(self.codes)+2))
+        for code in self.codes:
+            for target, weight in parties[code].get('redistribute', {}).items():
+                self.point[self.position[code], self.column(target)] = weight
+
+
+    # Weight array columns
+    def column(self, target):
+        """This method returns the weights column for a receiving party code, or the 'None' column."""
+        return len(self.codes)+1 if target is None else self.position[target]
+
+
+    # Sampling
+    def sample(self, scenarios):
+        """
+        This method draws redistribution weights for a number of scenarios.
+        An array <scenario, from-party, to-party> is returned, indexed by position in 'codes' with an extra all-zero party (for parties not in the data) and a final 'None' column.
+        """
+        weights = numpy.repeat(self.point[None], scenarios, axis = 0)
+        for code, prior in self.priors.items():
+            columns = [self.column(target) for target in prior]
+            weights[:, self.position[code]] = 0
+            weights[:, self.position[code], columns] = self.rng.dirichlet(list(prior.values()), size = scenarios)
+        return weights
+
+
+
+# Single group simulation
+def simulate_group(candidates, seats, weights, party_rows, party_labels, label_count):
+    """
+    This function counts one group under every scenario of a weights sample, using BatchElectionEngine.
+    'party_rows' gives each candidate's row in the weights array and 'party_labels' the column of the returned seat counts, which has 'label_count' columns.
+    An array <scenario, label> of seats won is returned.
+    """
+    scenarios = weights.shape[0]
+    votes = numpy.tile([float(candidate.votes) for candidate in candidates], (scenarios, 1))
+    matrices = weights[:, party_rows[:, None], party_rows[None, :]]
+    to_none = weights[:, party_rows, -1]
+    election = BatchElectionEngine([candidate.name for candidate in candidates], seats, votes, matrices, to_none)
+    election.run_election()
+    seats_won = numpy.zeros((scenarios, label_count), dtype = int)
+    rows, columns = numpy.nonzero(election.elected >= 0)
+    numpy.add.at(seats_won, (rows, party_labels[columns]), 1)
+    return seats_won
+
+
+# Chunk of group simulations
+def simulate_chunk(chunk, weights, labels):
+    """This function simulates a chunk of (candidates, seats, party rows, party labels) groups in a worker process, returning their total seats won."""
+    total = numpy.zeros((weights.shape[0], labels), dtype = int)
+    for candidates, seats, party_rows, party_labels in chunk:
+        total += simulate_group(candidates, seats, weights, party_rows, party_labels, labels)
+    return total
+
+
+# National simulation
+def simulate_seats(tasks, sampler, scenarios, batch_size = 1000, workers = None, chunk_size = 8):
+    """
+    This function runs a Monte Carlo simulation of a set of group counts, such as the national count over data/groups.json.
+    Each scenario uses one draw of the redistribution weights for every group, so the seat totals reflect weights shared across the country.
+    Scenarios are run in batches of 'batch_size' (which bounds memory use) and groups are spread across 'workers' processes in chunks of 'chunk_size'.
+    With workers = 0 everything is run in the calling process.
+
+    Required Parameters
+    ------
+    tasks: list <(list <Candidate>, int)>
+        The candidates standing and seats to be elected in each group.
+    sampler: RedistributionSampler
+        The redistribution weight sampler.
+    scenarios: int
+        The number of scenarios to run.
+
+    A (party labels, array <scenario, label>) pair of seats won is returned.
+    """
+
+    # Index candidate parties
+    labels = list(sampler.codes)
+    for candidates, seats in tasks:
+        for candidate in candidates:
+            if candidate.party not in labels:
+                labels.append(candidate.party)
+    label_position = {label: i for i, label in enumerate(labels)}
+    zero_row = len(sampler.codes)
+    groups = [(
+        candidates,
+        seats,
+        numpy.array([sampler.position.get(candidate.party, zero_row) for candidate in candidates]),
+        numpy.array([label_position[candidate.party] for candidate in candidates])
+    ) for candidates, seats in tasks]
+    chunks = [groups[i:i+chunk_size] for i in range(0, len(groups), chunk_size)]
+
+    # Run batches of scenarios
+    seats_won = numpy.zeros((scenarios, len(labels)), dtype = int)
+    executor = ProcessPoolExecutor(max_workers = workers) if workers != 0 else None
+    try:
+        for start in range(0, scenarios, batch_size):
+            weights = sampler.sample(min(batch_size, scenarios - start))
+            if executor:
+                totals = executor.map(simulate_chunk, chunks, [weights] * len(chunks), [len(labels)] * len(chunks))
+            else:
+                totals = (simulate_chunk(chunk, weights, len(labels)) for chunk in chunks)
+            for total in totals:
+                seats_won[start:start+weights.shape[0]] += total
+    finally:
+        if executor:
+            executor.shutdown()
+    return labels, seats_won
+
+
+# Seat distribution summary
+def seat_distribution(labels, seats_won, interval = 0.9):
+    """
+    This function summarises the seats won across scenarios for each party that won a seat in any scenario.
+    A dictionary of party to its mean seats, central 'interval' range, probability of winning the most seats and probability of each seat total is returned.
+    """
+    scenarios = seats_won.shape[0]
+    most = seats_won.max(axis = 1)
+    low, high = numpy.quantile(seats_won, [(1-interval)/2, (1+interval)/2], axis = 0)
+    summary = {}
+    for i, label in enumerate(labels):
+        if not seats_won[:, i].any():
+            continue
+        totals, counts = numpy.unique(seats_won[:, i], return_counts = True)
+        summary[label] = {
+            'mean': seats_won[:, i].mean(),
+            'interval': (int(low[i]), int(high[i])),
+            'most_seats': (seats_won[:, i] == most).sum()/scenarios,
+            'probabilities': {int(total): count/scenarios for total, count in zip(totals, counts)}
+        }
+    return summary
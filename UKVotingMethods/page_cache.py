@@ -0,0 +1,159 @@
+from hashlib import sha256
+from threading import Lock, get_ident
+import gzip
+import json
+import os
+
+from requests import get as get_request
+
+
+# Cached page file reader
+def read_page_file(path):
+    """This function returns the text of a cached page file, given its path without an extension, for readers that do not hold the PageCache (such as worker processes)."""
+    with gzip.open(path + '.html.gz', 'rt', encoding = 'utf-8') as file:
+        return file.read()
+
+
+
+# On-disk page cache
+class PageCache():
+    """
+    This class keeps downloaded pages on disk, so that re-scrapes and parser development can work from local copies.
+    Each page is stored gzip-compressed under the SHA-256 hash of its url, next to a small metadata file holding the url and its ETag and Last-Modified headers.
+    Cached pages are revalidated with a conditional request, so unchanged pages are not downloaded again.
+    The cache is bounded in size, evicting the least recently used pages first.
+    """
+
+    # Initialisation routine
+    def __init__(self, directory, max_bytes = 500 * 2**20, revalidate = True):
+        """
+        This method opens (and if necessary creates) a cache directory.
+
+        Required Parameters
+        ------
+        directory: str
+            The directory holding the cached pages.
+
+        Optional Parameters
+        ------
+        max_bytes: int (default = 500 MB)
+            The largest total size of compressed pages to keep.
+        revalidate: bool (default = True)
+            Whether to check cached pages with the server. If False, cached pages are used without any network access.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.lock = Lock()
+        os.makedirs(directory, exist_ok = True)
+        self.total_size = sum(size for _, size, _ in self.pages())
+
+
+    # File locations
+    def path(self, url):
+        """This method returns the path of a page's files, without an extension."""
+        return os.path.join(self.directory, sha256(url.encode('utf-8')).hexdigest())
+
+
+    # Cache reading
+    def metadata(self, url):
+        """This method returns the metadata stored for a page, or None if the page is not cached."""
+        try:
+            with open(self.path(url) + '.json', encoding = 'utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def read(self, url):
+        """This method returns the text of a cached page, marking it as recently used, or None if the page is not cached."""
+        try:
+            text = read_page_file(self.path(url))
+        except FileNotFoundError:
+            return None
+        os.utime(self.path(url) + '.html.gz')
+        return text
+
+
+    # Cache writing
+    def store(self, url, text, etag = None, last_modified = None):
+        """
+        This method writes a page and its metadata to the cache, then evicts old pages if the cache is too large.
+        Files are written under temporary names and then moved into place, so a page is never left half-written.
+        """
+        path = self.path(url)
+        temp = '.{}.tmp'.format(get_ident())
+        with gzip.open(path + '.html.gz' + temp, 'wt', encoding = 'utf-8') as file:
+            file.write(text)
+        with open(path + '.json' + temp, 'w', encoding = 'utf-8') as file:
+            json.dump({'url': url, 'etag': etag, 'last_modified': last_modified}, file)
+        with self.lock:
+            if os.path.exists(path + '.html.gz'):
+                self.total_size -= os.path.getsize(path + '.html.gz')
+            self.total_size += os.path.getsize(path + '.html.gz' + temp)
+            os.replace(path + '.html.gz' + temp, path + '.html.gz')
+            os.replace(path + '.json' + temp, path + '.json')
+        if self.total_size > self.max_bytes:
+            self.evict()
+
+
+    # Cached page listing
+    def pages(self):
+        """This method returns a (last used time, size, path) entry for every cached page."""
+        pages = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.html.gz'):
+                stat = entry.stat()
+                pages.append((stat.st_mtime, stat.st_size, entry.path[:-len('.html.gz')]))
+        return pages
+
+
+    # Least-recently-used eviction
+    def evict(self):
+        """This method deletes the least recently used pages until the cache fits within 'max_bytes'."""
+        with self.lock:
+            pages = self.pages()
+            self.total_size = sum(size for _, size, _ in pages)
+            for _, size, path in sorted(pages):
+                if self.total_size <= self.max_bytes:
+                    break
+                for extension in ('.html.gz', '.json'):
+                    try:
+                        os.remove(path + extension)
+                    except FileNotFoundError:
+                        pass
+                self.total_size -= size
+
+
+    # Page fetcher
+    def fetch(self, url, session = None):
+        """
+        This method returns the text of a page, using the cached copy where possible.
+        Cached pages are revalidated with If-None-Match and If-Modified-Since headers, and only downloaded again if the server reports a change.
+        """
+
+        # Use cached copy without revalidation
+        metadata = self.metadata(url)
+        if metadata and not self.revalidate:
+            text = self.read(url)
+            if text is not None:
+                return text
+
+        # Make conditional request
+        headers = {}
+        if metadata and metadata.get('etag'):
+            headers['If-None-Match'] = metadata['etag']
+        if metadata and metadata.get('last_modified'):
+            headers['If-Modified-Since'] = metadata['last_modified']
+        request = (session.get if session else get_request)(url, headers = headers)
+
+        # Unchanged page
+        if request.status_code == 304:
+            text = self.read(url)
+            if text is not None:
+                return text
+            request = (session.get if session else get_request)(url)
+
+        # New or changed page
+        request.raise_for_status()
+        self.store(url, request.text, request.headers.get('ETag'), request.headers.get('Last-Modified'))
+        return request.text
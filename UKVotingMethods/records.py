@@ -0,0 +1,257 @@
+import json
+import os
+
+
+# Candidate record
+class Candidate():
+    """
+    This class holds a single candidate's name, party and vote tally.
+    It uses __slots__ rather than a per-instance dictionary, which cuts the memory used by the full 2015 results by around a third (see scripts/benchmark_records.py).
+    """
+    __slots__ = ('name', 'party', 'votes')
+
+    def __init__(self, name, party, votes):
+        self.name = name
+        self.party = party
+        self.votes = votes
+
+    def __eq__(self, other):
+        return isinstance(other, Candidate) and (self.name, self.party, self.votes) == (other.name, other.party, other.votes)
+
+    def __repr__(self):
+        return 'Candidate({!r}, {!r}, {!r})'.format(self.name, self.party, self.votes)
+
+    # Conversion to and from the results file format
+    def to_dict(self):
+        """This method returns the candidate in the dictionary form used by the results files."""
+        return {'name': self.name, 'party': self.party, 'votes': self.votes}
+
+    @classmethod
+    def from_dict(cls, data):
+        """This method creates a candidate from the dictionary form used by the results files."""
+        return cls(data['name'], data['party'], data['votes'])
+
+
+
+# Constituency result record
+class ConstituencyResult():
+    """This class holds the candidates standing in a single constituency."""
+    __slots__ = ('name', 'candidates')
+
+    def __init__(self, name, candidates):
+        self.name = name
+        self.candidates = candidates
+
+    def __eq__(self, other):
+        return isinstance(other, ConstituencyResult) and (self.name, self.candidates) == (other.name, other.candidates)
+
+    def __repr__(self):
+        return 'ConstituencyResult({!r}, {!r})'.format(self.name, self.candidates)
+
+    # Conversion to and from the results file format
+    def to_list(self):
+        """This method returns the candidates in the list-of-dictionaries form used by the results files."""
+        return [candidate.to_dict() for candidate in self.candidates]
+
+    @classmethod
+    def from_list(cls, name, data):
+        """This method creates a constituency result from the list-of-dictionaries form used by the results files."""
+        return cls(name, [Candidate.from_dict(candidate) for candidate in data])
+
+
+
+# Voting round record
+class RoundResult():
+    """This class holds the candidates elected and eliminated in a single voting round of an election."""
+    __slots__ = ('number', 'elected', 'eliminated')
+
+    def __init__(self, number, elected, eliminated):
+        self.number = number
+        self.elected = elected
+        self.eliminated = eliminated
+
+    def __eq__(self, other):
+        return isinstance(other, RoundResult) and (self.number, self.elected, self.eliminated) == (other.number, other.elected, other.eliminated)
+
+    def __repr__(self):
+        return 'RoundResult({!r}, {!r}, {!r})'.format(self.number, self.elected, self.eliminated)
+
+
+
+# Results file loader
+def load_results(path):
+    """
+    This function loads a results file (such as data/results_2015.json) into ConstituencyResult records.
+    A dictionary of constituency name to result is returned.
+    """
+    with open(path, encoding = 'utf-8') as file:
+        data = json.load(file)
+    return {name: ConstituencyResult.from_list(name, candidates) for name, candidates in data.items()}
+
+
+
+# Results lines file
+def index_path(path):
+    """This function returns the path of the offset index kept alongside a results lines file."""
+    return path + '.index'
+
+
+def write_results_lines(results, path):
+    """
+    This function writes ConstituencyResult records to a results lines file (such as data/results_2015.jsonl), one constituency per line.
+    An offset index mapping each constituency name to the position and length of its line is written alongside, so single constituencies can be read without loading the whole file.
+    """
+    index = {}
+    with open(path, 'wb') as file:
+        for name, result in results.items():
+            line = (json.dumps([name, result.to_list()]) + '\n').encode('utf-8')
+            index[name] = [file.tell(), len(line)]
+            file.write(line)
+    with open(index_path(path), 'w', encoding = 'utf-8') as file:
+        json.dump(index, file)
+
+
+def convert_results_to_lines(json_path, lines_path):
+    """This function converts a results file (such as data/results_2015.json) to a results lines file and its index."""
+    write_results_lines(load_results(json_path), lines_path)
+
+
+def convert_lines_to_results(lines_path, json_path):
+    """This function converts a results lines file back to a results file, keeping the constituency order."""
+    with ResultsStore(lines_path) as store:
+        results = store.load(store.names())
+    with open(json_path, 'w', encoding = 'utf-8') as file:
+        json.dump({name: result.to_list() for name, result in results.items()}, file)
+
+
+
+# Results lines reader
+class ResultsStore():
+    """
+    This class reads constituencies from a results lines file on demand, using its offset index to seek straight to each line.
+    Only the index is loaded up front, so a runner counting a handful of constituencies never parses the rest of the file.
+    """
+
+    # Initialisation routine
+    def __init__(self, path):
+        """
+        This method opens a results lines file and loads its index.
+
+        Required Parameters
+        ------
+        path: str
+            The results lines file, as written by write_results_lines().
+        """
+        self.path = path
+        with open(index_path(path), encoding = 'utf-8') as file:
+            self.index = json.load(file)
+        self.file = open(path, 'rb')
+
+
+    # Constituency names
+    def names(self):
+        """This method returns the constituency names in file order."""
+        return list(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+
+    # Constituency loading
+    def __getitem__(self, name):
+        """This method reads a single constituency, raising a KeyError if it is not in the file."""
+        offset, length = self.index[name]
+        self.file.seek(offset)
+        stored_name, candidates = json.loads(self.file.read(length))
+        return ConstituencyResult.from_list(stored_name, candidates)
+
+    def load(self, names):
+        """This method reads a set of constituencies in file order, returning a dictionary of name to ConstituencyResult."""
+        names = sorted(set(names), key = lambda name: self.index[name][0])
+        return {name: self[name] for name in names}
+
+
+    # Closing
+    def close(self):
+        """This method closes the results lines file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+
+# Append-only results checkpoint
+class ResultsCheckpoint():
+    """
+    This class records constituency results as they are scraped, one line per constituency in the results lines format, so a long scrape can be resumed after a failure.
+    Each line is flushed to disk as soon as it is written.
+    A line left half-written by an interrupted run (including one missing only its newline) is cut off when the checkpoint is reopened.
+    """
+
+    # Initialisation routine
+    def __init__(self, path):
+        """
+        This method opens a checkpoint file, loading any results already recorded in it.
+
+        Required Parameters
+        ------
+        path: str
+            The checkpoint file. It is created if it does not exist.
+        """
+        self.path = path
+        self.results = {}
+
+        # Read complete lines, which end with a newline and parse
+        good_size = 0
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        name, candidates = json.loads(line)
+                    except ValueError:
+                        break
+                    self.results[name] = ConstituencyResult.from_list(name, candidates)
+                    good_size += len(line)
+
+        # Open for appending, dropping any partial line
+        self.file = open(path, 'ab')
+        self.file.truncate(good_size)
+
+
+    # Recorded results
+    def __contains__(self, name):
+        return name in self.results
+
+    def __len__(self):
+        return len(self.results)
+
+
+    # Result recording
+    def append(self, result):
+        """This method records a ConstituencyResult, writing it through to disk."""
+        line = json.dumps([result.name, result.to_list()]) + '\n'
+        self.file.write(line.encode('utf-8'))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.results[result.name] = result
+
+
+    # Closing
+    def close(self):
+        """This method closes the checkpoint file."""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
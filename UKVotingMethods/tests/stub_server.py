@@ -0,0 +1,41 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase
+
+
+# Stub page request handler
+class Stub_Handler(BaseHTTPRequestHandler):
+    """This request handler is the base for the stub servers used in tests. Subclasses provide do_GET(), and request logging is turned off."""
+
+    def send_body(self, body, headers = {}):
+        """This method sends a 200 response with the given text body and any extra headers."""
+        body = body.encode('utf-8')
+        self.send_response(200)
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+
+# Tests against a local stub server
+class Stub_Server_Test_Case(TestCase):
+    """This test class runs a threaded local server with the request handler in 'handler' for the tests of a subclass, with its address in 'base_url'."""
+    handler = Stub_Handler
+
+    # Start server
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), cls.handler)
+        cls.base_url = 'http://127.0.0.1:{}/'.format(cls.server.server_address[1])
+        Thread(target = cls.server.serve_forever, daemon = True).start()
+
+    # Stop server
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
@@ -0,0 +1,153 @@
+from unittest import TestCase
+from ..voting_engines import DirectElectionEngine
+from ..array_engines import ArrayElectionEngine, BatchElectionEngine, CandidateRegistry, build_matrix_arrays
+
+
+# ArrayElectionEngine results tests
+class Array_Election__Tests(TestCase):
+    """This test class checks that ArrayElectionEngine gives the same results as DirectElectionEngine."""
+
+    # Comparison helper
+    def assertMatchesDirect(self, candidates, seats, votes, matrix = {}):
+        """This method runs the same election with both engines and compares the results."""
+
+        # Run elections
+        direct = DirectElectionEngine(candidates, seats = seats, votes = votes, redistribution_matrix = matrix)
+        array = ArrayElectionEngine(candidates, seats = seats, votes = votes, redistribution_matrix = matrix)
+        direct.run_election()
+        array.run_election()
+
+        # Test results
+        self.assertEqual(array.quota, direct.quota)
+        self.assertEqual(array.elected, direct.elected)
+        self.assertEqual(array.eliminated, direct.eliminated)
+        self.assertEqual(len(array.votes), len(direct.votes))
+        for i in range(len(direct.votes)):
+            self.assertEqual(array.round_votes(i), direct.votes[i])
+        return array
+
+
+    # First-past-the-post
+    def test__fptp(self):
+        """Candidate B should be elected outright."""
+        array = self.assertMatchesDirect(['A', 'B', 'C'], 1, {'A': 5, 'B': 20, 'C': 3})
+        self.assertEqual(array.elected, ['B'])
+
+
+    # Two candidates tied
+    def test__tie(self):
+        """Candidate A should be eliminated because they are listed first."""
+        array = self.assertMatchesDirect(['A', 'B'], 1, {'A': 10, 'B': 10})
+        self.assertEqual(array.eliminated, ['A'])
+
+
+    # Alternative vote with transfers
+    def test__alternative_vote(self):
+        """Candidate C's votes should elect A."""
+        array = self.assertMatchesDirect(
+            ['A', 'B', 'C'],
+            1,
+            {'A': 40, 'B': 45, 'C': 15},
+            {'C': {'A': 3, 'B': 1, None: 1}}
+        )
+        self.assertEqual(array.elected, ['A'])
+
+
+    # Single transferable vote with a surplus
+    def test__single_transferable_vote(self):
+        """Candidate A's surplus should elect C ahead of B."""
+        array = self.assertMatchesDirect(
+            ['A', 'B', 'C', 'D'],
+            2,
+            {'A': 50, 'B': 20, 'C': 18, 'D': 12},
+            {'A': {'C': 1}, 'D': {'B': 1, 'C': 1}}
+        )
+        self.assertEqual(array.elected, ['A', 'C'])
+
+
+    # Candidate without votes
+    def test__candidate_without_votes(self):
+        """Candidate D has no votes and should play no part in the count."""
+        array = self.assertMatchesDirect(
+            ['D', 'A', 'B', 'C'],
+            1,
+            {'A': 40, 'B': 45, 'C': 15},
+            {'C': {'A': 3, 'D': 5}}
+        )
+        self.assertNotIn('D', array.elected + array.eliminated)
+
+
+    # Unsupported count options
+    def test__unsupported_options(self):
+        """A ValueError should be raised for count options the array count does not implement, while their default values are accepted."""
+        for option, value in (('history', 'deltas'), ('arithmetic', 'fixed'), ('arithmetic', 'fraction'), ('bulk_exclusion', True), ('last_seat_shortcut', True), ('surplus', 'gregory'), ('surplus', 'meek')):
+            self.assertRaises(ValueError, ArrayElectionEngine, ['A', 'B'], **{option: value})
+        ArrayElectionEngine(['A', 'B'], history = 'full', arithmetic = 'float', bulk_exclusion = False, last_seat_shortcut = False, surplus = 'inclusive')
+
+
+
+# BatchElectionEngine tests
+class Batch_Election__Tests(TestCase):
+    """This test class checks that BatchElectionEngine gives the same results as separate DirectElectionEngine counts."""
+
+    # Test setup
+    def setUp(self):
+        """This method creates four candidates for two seats and three redistribution scenarios."""
+        self.candidates = ['A', 'B', 'C', 'D']
+        self.votes = {'A': 50, 'B': 20, 'C': 18, 'D': 12}
+        self.matrices = [
+            {'A': {'C': 1}, 'D': {'B': 1, 'C': 1}},
+            {'A': {'B': 1}, 'D': {'B': 1}},
+            {'A': {'B': 1, None: 9}, 'D': {'C': 1}}
+        ]
+
+
+    # Scenarios match separate counts
+    def test__scenarios_match_direct(self):
+        """Each scenario should elect the same candidates, in the same order, as a separate count."""
+
+        # Run batch
+        arrays = [build_matrix_arrays(self.candidates, matrix) for matrix in self.matrices]
+        batch = BatchElectionEngine(
+            self.candidates,
+            2,
+            [list(self.votes.values())] * len(self.matrices),
+            [weights for weights, to_none, has_row in arrays],
+            [to_none for weights, to_none, has_row in arrays]
+        )
+        batch.run_election()
+
+        # Run separate counts and test
+        for matrix, elected in zip(self.matrices, batch.elected_sets()):
+            direct = DirectElectionEngine(self.candidates, seats = 2, votes = self.votes, redistribution_matrix = matrix)
+            direct.run_election()
+            self.assertEqual(elected, direct.elected)
+
+
+    # Candidates not standing
+    def test__not_standing(self):
+        """Candidates marked with NaN should not be elected, even by default."""
+        batch = BatchElectionEngine(
+            ['A', 'B', 'C'],
+            2,
+            [[10, float('nan'), 5], [10, 7, 5]],
+            [[0, 0, 0]] * 3
+        )
+        batch.run_election()
+        self.assertEqual(batch.elected_sets(), [['A', 'C'], ['A', 'B']])
+
+
+
+# CandidateRegistry tests
+class Candidate_Registry__Tests(TestCase):
+    """This test class checks the interning of candidate names to the array positions used by ArrayElectionEngine."""
+
+    # Dense IDs
+    def test__dense_ids(self):
+        """Candidates should be given IDs in the order first seen, with repeats ignored."""
+        registry = CandidateRegistry(['A', 'B', 'A', 'C'])
+        self.assertEqual(registry.ids, {'A': 0, 'B': 1, 'C': 2})
+        self.assertEqual(registry.names, ['A', 'B', 'C'])
+        self.assertEqual(registry.intern('D'), 3)
+        self.assertIn('D', registry)
+        self.assertNotIn('E', registry)
@@ -0,0 +1,88 @@
+from unittest import TestCase
+from ..ballot_engines import BallotElectionEngine, BallotTrie, ballots_from_matrix
+from ..voting_engines import DirectElectionEngine
+
+
+# BallotTrie tests
+class Ballot_Trie__Tests(TestCase):
+    """This test class checks the storage of ranked ballots in BallotTrie."""
+
+    # Deduplication and shared prefixes
+    def test__deduplication(self):
+        """Identical ballots should be merged and shared first preferences stored once."""
+        trie = BallotTrie([(('A', 'B'), 3), (('A', 'B'), 2), (('A', 'C', 'B'), 1), (('A',), 4), (('B',), 5)])
+        self.assertEqual(len(trie), 4)
+        self.assertEqual(len(trie.candidate), 6)
+        self.assertEqual(trie.first_preferences(), {'A': 10, 'B': 5})
+        self.assertEqual(sorted(trie.ballots()), [(('A',), 4), (('A', 'B'), 5), (('A', 'C', 'B'), 1), (('B',), 5)])
+
+
+    # Repeated preferences
+    def test__repeated_preference(self):
+        """A ballot ranking a candidate twice should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            BallotTrie().add(('A', 'B', 'A'))
+
+
+
+# BallotElectionEngine tests
+class Ballot_Election__Tests(TestCase):
+    """This test class checks elections counted from ranked ballots."""
+
+    # Single transferable vote
+    def test__stv(self):
+        """
+        The quota is 34 and A is elected with a surplus of 16, carried at a transfer value of 16/50 (8 votes to B, 8 votes to D).
+        C (15) is then excluded, whose ballots pass over A to B (25 + 8 + 15 = 48), electing B ahead of D (17).
+        """
+        election = BallotElectionEngine(['A', 'B', 'C', 'D'], 2, [
+            (('A', 'B'), 25), (('A', 'D'), 25), (('B',), 25), (('C', 'A', 'B'), 15), (('D',), 9)
+        ])
+        election.run_election()
+        self.assertEqual(election.quota, 34)
+        self.assertEqual(election.elected, ['A', 'B'])
+        self.assertEqual(election.eliminated, ['C'])
+        self.assertAlmostEqual(election.votes[-1]['B'], 48)
+
+
+    # Exhausted ballots
+    def test__exhausted(self):
+        """Ballots with no continuing preference should leave the count."""
+        election = BallotElectionEngine(['A', 'B', 'C'], 1, [(('A',), 40), (('B',), 35), (('C', 'B'), 10), (('C',), 15)])
+        election.run_election()
+        self.assertEqual(election.votes[1], {'A': 40, 'B': 45})
+
+
+    # Write-in candidates
+    def test__write_in(self):
+        """A ballot ranking a candidate who is not standing should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            BallotElectionEngine(['A', 'B'], 1, [(('A', 'Z'), 1)])
+
+
+    # Unsupported surplus methods
+    def test__surplus(self):
+        """Only the inclusive surplus method should be accepted, with a ValueError raised for the others."""
+        BallotElectionEngine(['A', 'B'], 1, surplus = 'inclusive')
+        for surplus in ('gregory', 'meek'):
+            with self.assertRaises(ValueError):
+                BallotElectionEngine(['A', 'B'], 1, surplus = surplus)
+
+
+    # Synthetic ballots
+    def test__synthetic_ballots(self):
+        """Ballots generated from a redistribution matrix should give the same count as the matrix."""
+        votes = {'A': 300, 'B': 120, 'C': 260, 'D': 90, 'E': 230}
+        matrix = {
+            'A': {'B': 1},
+            'B': {'A': 0.7, 'E': 0.2, None: 0.1},
+            'C': {'D': 1},
+            'D': {'C': 0.8, None: 0.2},
+            'E': {'C': 0.5, 'A': 0.5}
+        }
+        direct = DirectElectionEngine(list(votes), 3, votes, matrix)
+        direct.run_election()
+        ballots = BallotElectionEngine(list(votes), 3, ballots_from_matrix(votes, matrix), arithmetic = 'fraction')
+        ballots.run_election()
+        self.assertEqual(ballots.elected, direct.elected)
+        self.assertEqual(ballots.eliminated, direct.eliminated)
@@ -0,0 +1,46 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+from ..ballot_engines import BallotTrie
+from ..ballot_generator import BallotWriter, generate_ballots, read_ballot_chunks, read_ballots
+
+
+# Example votes and matrix
+VOTES = {'A': 50000, 'B': 30000, 'C': 20000}
+MATRIX = {'A': {'B': 3, None: 1}, 'B': {'A': 1, 'C': 1}, 'C': {'A': 1, 'B': 1, None: 2}}
+
+
+
+# Ballot generator tests
+class Ballot_Generator__Tests(TestCase):
+    """This test class checks synthetic ballot generation and the ballot file format."""
+
+    # Generated ballots
+    def test__generate(self):
+        """Ballots should keep the first-preference votes, follow the matrix rows and be repeatable with a seed."""
+        ballots = list(generate_ballots(VOTES, MATRIX, seed = 1))
+        self.assertEqual(ballots, list(generate_ballots(VOTES, MATRIX, seed = 1)))
+        self.assertEqual(BallotTrie(ballots).first_preferences(), VOTES)
+        self.assertNotIn(('A', 'C'), [preferences[:2] for preferences, count in ballots])
+        a_ending = sum(count for preferences, count in ballots if preferences == ('A',))
+        self.assertAlmostEqual(a_ending/VOTES['A'], 0.25, delta = 0.02)
+
+
+    # Maximum depth
+    def test__max_depth(self):
+        """No ballot should have more than 'max_depth' preferences."""
+        self.assertEqual(max(len(preferences) for preferences, count in generate_ballots(VOTES, MATRIX, max_depth = 2)), 2)
+
+
+    # Ballot files
+    def test__file_round_trip(self):
+        """Ballots written across several chunks should be read back unchanged."""
+        ballots = list(generate_ballots(VOTES, MATRIX, seed = 2))
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test.ballots')
+            with BallotWriter(path, list(VOTES), chunk_size = 3) as writer:
+                for preferences, count in ballots:
+                    writer.write(preferences, count)
+            self.assertEqual(writer.ballots, sum(VOTES.values()))
+            self.assertEqual(list(read_ballots(path)), ballots)
+            self.assertEqual(len(list(read_ballot_chunks(path))), 1 + -(-len(ballots)//3))
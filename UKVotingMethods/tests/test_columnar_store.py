@@ -0,0 +1,43 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import numpy
+from ..columnar_store import ColumnarStore, write_columnar_store
+from ..records import Candidate, ConstituencyResult
+
+
+# Columnar store tests
+class Columnar_Store__Tests(TestCase):
+    """This test class checks that elections read back from a columnar store match the records written to it."""
+
+    # Round trip
+    def test__round_trip(self):
+        """Two elections sharing names should be read back unchanged, with each shared string stored once."""
+        elections = {
+            year: {
+                name: ConstituencyResult(name, [Candidate(name + ' A', 'Lab', 100 + year), Candidate('Ynys Môn B', 'Con', 80)])
+                for name in ['Oxford East', 'Banbury']
+            }
+            for year in (2015, 2017)
+        }
+        with TemporaryDirectory() as directory:
+            write_columnar_store(directory, elections)
+            store = ColumnarStore(directory)
+            self.assertEqual(store.years(), [2015, 2017])
+            self.assertEqual(len(store.strings()), len(set(store.strings())))
+            for year in (2015, 2017):
+                election = store.election(year)
+                self.assertEqual(election.names(), ['Oxford East', 'Banbury'])
+                self.assertEqual(election.load(['Banbury', 'Oxford East']), elections[year])
+
+
+    # Column slices
+    def test__columns(self):
+        """A constituency's columns should be slices of the memory-mapped arrays."""
+        with TemporaryDirectory() as directory:
+            write_columnar_store(directory, {2015: {'Banbury': ConstituencyResult('Banbury', [Candidate('A', 'Lab', 100), Candidate('B', 'Con', 80)])}})
+            election = ColumnarStore(directory).election(2015)
+            names, parties, votes = election.columns('Banbury')
+            self.assertEqual(list(votes), [100, 80])
+            self.assertTrue(numpy.shares_memory(votes, election.votes))
+            with self.assertRaises(KeyError):
+                ColumnarStore(directory).election(2010)
@@ -1,5 +1,6 @@
+from fractions import Fraction
 from unittest import TestCase
-from ..voting_engines import DirectElectionEngine
+from ..voting_engines import DirectElectionEngine, TallyRanking, TransferTable
 
 
 # DirectElectionEngine.add_votes() tests
@@ -34,6 +35,20 @@ class Add_Votes__Tests(TestCase):
         )
 
 
+    # Changed candidates list
+    def test__changed_candidates(self):
+        """Votes should be checked against the candidates list as it is now, whether it has been replaced or changed in place."""
+        engine = DirectElectionEngine(['A', 'B'])
+        engine.add_votes({'A': 1, 'B': 2})
+        engine.candidates[0] = 'Z'
+        self.assertRaises(ValueError, engine.add_votes, {'A': 1, 'B': 2})
+        engine.add_votes({'Z': 1, 'B': 2})
+        engine.candidates = ['C']
+        self.assertRaises(ValueError, engine.add_votes, {'Z': 1})
+        engine.add_votes({'C': 3})
+        self.assertEqual(engine.votes, [{'C': 3}])
+
+
     # Single candidate for one seat with an even number of votes
     def test__single_seat__single_candidate__even_votes(self):
         """The quota here should be 6."""
@@ -470,6 +485,17 @@ class Find_Winner__Tests(TestCase):
         self.assertEqual(winner, 'B')
 
 
+    # Votes changed between calls
+    def test__changed_votes(self):
+        """The winner should be found from the votes as they are now, even if the same dictionary was passed in before."""
+        votes = {'A': 10, 'B': 30, 'C': 20}
+        self.assertEqual(self.engine.find_winner(votes), 'B')
+        votes['B'] = 5
+        votes['A'] = 40
+        self.assertEqual(self.engine.find_winner(votes), 'A')
+        self.assertEqual(self.engine.find_loser(votes), 'B')
+
+
 
 # DirectElectionEngine.find_loser() tests
 class Find_Loser__Tests(TestCase):
@@ -507,6 +533,50 @@ class Find_Loser__Tests(TestCase):
 
 
 
+# TallyRanking tests
+class Tally_Ranking__Tests(TestCase):
+    """This test class checks the heaps used by DirectElectionEngine to find each round's winner and loser."""
+
+    # Ties
+    def test__ties(self):
+        """Tied candidates should be ranked in favour of the candidate listed first, for both the leader and the trailer."""
+        ranking = TallyRanking({'A': 10, 'B': 20, 'C': 20, 'D': 10})
+        self.assertEqual(ranking.leader(), ('B', 20))
+        self.assertEqual(ranking.trailer(), ('A', 10))
+
+
+    # Tally updates
+    def test__update(self):
+        """Updated tallies should replace the old heap entries."""
+        tallies = {'A': 10, 'B': 20, 'C': 15}
+        ranking = TallyRanking(tallies)
+        tallies['A'] = 25
+        ranking.update('A')
+        tallies['B'] = 5
+        ranking.update('B')
+        self.assertEqual(ranking.leader(), ('A', 25))
+        self.assertEqual(ranking.trailer(), ('B', 5))
+
+
+    # Ranking carried across rounds
+    def test__carried_across_rounds(self):
+        """redistribute_votes() should move the ranking on to the next round's votes, updating the candidates who received votes."""
+        engine = DirectElectionEngine(
+            ['A', 'B', 'C'],
+            votes = {'A': 10, 'B': 25, 'C': 20},
+            redistribution_matrix = {'A': {'C': 1}}
+        )
+        engine.quota = 100
+        ranking = engine.get_ranking(engine.votes[-1])
+        self.assertEqual(engine.ranked_loser(), 'A')
+        engine.redistribute_votes('A')
+        self.assertIs(engine.ranking, ranking)
+        self.assertIs(ranking.tallies, engine.votes[-1])
+        self.assertEqual(ranking.leader(), ('C', 30))
+        self.assertEqual(engine.ranked_loser(), 'B')
+
+
+
 # DirectElectionEngine.redistribute_votes() tests
 class Redistribute_Votes__Tests(TestCase):
     """This test class checks the behaviour of the DirectElectionEngine.redistribute_votes() method."""
@@ -686,3 +756,215 @@ class Redistribute_Votes__Tests(TestCase):
             ]
         )
 
+
+
+
+# VoteHistory tests
+class Vote_History__Tests(TestCase):
+    """This test class checks that the 'deltas' history mode records the same rounds as the default 'full' mode."""
+
+    # Test setup
+    def setUp(self):
+        """
+        This method creates matching elections in both history modes, with three candidates running for one seat.
+        A is eliminated first and their votes split between B and C, taking B over the quota.
+        """
+        settings = {
+            'votes': {'A': 10, 'B': 25, 'C': 20},
+            'redistribution_matrix': {'A': {'B': 2, 'C': 3}}
+        }
+        self.full = DirectElectionEngine(['A', 'B', 'C'], **settings)
+        self.deltas = DirectElectionEngine(['A', 'B', 'C'], history = 'deltas', **settings)
+
+
+    # Unknown history mode
+    def test__unknown_mode(self):
+        """A ValueError should be raised."""
+        self.assertRaises(
+            ValueError,
+            DirectElectionEngine,
+            ['A'],
+            history = 'partial'
+        )
+
+
+    # Matching rounds
+    def test__rounds_match(self):
+        """Both modes should give the same results and the same votes for every round."""
+
+        # Run elections
+        self.full.run_election()
+        self.deltas.run_election()
+
+        # Test results
+        self.assertEqual(self.deltas.elected, self.full.elected)
+        self.assertEqual(self.deltas.eliminated, self.full.eliminated)
+        self.assertEqual(len(self.deltas.votes), len(self.full.votes))
+        self.assertEqual(self.deltas.votes, self.full.votes)
+        for i in range(-len(self.full.votes), len(self.full.votes)):
+            self.assertEqual(self.deltas.votes[i], self.full.votes[i])
+
+
+    # Sliced rounds
+    def test__slices(self):
+        """Slicing the history should give a list of rounds, as slicing the 'full' mode list does."""
+        self.full.run_election()
+        self.deltas.run_election()
+        for rounds in (slice(1, None), slice(None, -1), slice(None, None, -1), slice(5, None)):
+            self.assertEqual(self.deltas.votes[rounds], self.full.votes[rounds])
+        self.assertIs(self.deltas.votes[-1:][0], self.deltas.votes.current)
+
+
+    # Only changes are stored
+    def test__changes_stored(self):
+        """Only the candidates whose votes changed should be recorded for each round."""
+        self.deltas.redistribute_votes('A')
+        self.assertEqual(self.deltas.votes.changes, [(['A'], {'B': 29, 'C': 26})])
+
+
+    # Several removals in one round
+    def test__bulk_exclusion(self):
+        """Candidates removed together in a bulk exclusion should be replayed as a single round."""
+        settings = {
+            'votes': {'A': 40, 'B': 35, 'C': 3, 'D': 2, 'E': 1},
+            'redistribution_matrix': {'D': {'C': 1}, 'C': {'B': 1}},
+            'bulk_exclusion': True
+        }
+        full = DirectElectionEngine(['A', 'B', 'C', 'D', 'E'], **settings)
+        deltas = DirectElectionEngine(['A', 'B', 'C', 'D', 'E'], history = 'deltas', **settings)
+        full.run_election()
+        deltas.run_election()
+        self.assertEqual(deltas.votes.changes[0], (['E', 'D', 'C'], {'B': 40}))
+        self.assertEqual(deltas.votes, full.votes)
+
+
+    # First-round votes untouched
+    def test__input_votes_untouched(self):
+        """The dictionary of first-round votes passed in should not be altered by the count."""
+        votes = {'A': 10, 'B': 25, 'C': 20}
+        engine = DirectElectionEngine(['A', 'B', 'C'], votes = votes, history = 'deltas')
+        engine.redistribute_votes('A')
+        self.assertEqual(votes, {'A': 10, 'B': 25, 'C': 20})
+        self.assertEqual(engine.votes[0], {'A': 10, 'B': 25, 'C': 20})
+
+
+
+# TransferTable tests
+class Transfer_Table__Tests(TestCase):
+    """This test class checks the compressed redistribution rows used by DirectElectionEngine.redistribute_votes()."""
+
+    # Test setup
+    def setUp(self):
+        """This method compresses a matrix with two rows, one of which sends votes to 'None'."""
+        self.table = TransferTable({
+            'A': {'B': 2, 'C': 3},
+            'B': {'A': 1, None: 4, 'C': 5}
+        })
+
+
+    # Layout
+    def test__layout(self):
+        """The rows should share flat lists, with 'None' held separately."""
+        self.assertEqual(self.table.targets, ['B', 'C', 'A', 'C'])
+        self.assertEqual(self.table.weights, [2, 3, 1, 5])
+        self.assertEqual(self.table.rows, {'A': (0, 2), 'B': (2, 4)})
+        self.assertEqual(self.table.to_none, {'B': 4})
+
+
+    # All candidates standing
+    def test__all_standing(self):
+        """The full row and its total weight, including 'None', should be returned."""
+        self.assertEqual(
+            self.table.standing_row('B', {'A': 1, 'C': 1}),
+            ([('A', 1), ('C', 5)], 10)
+        )
+
+
+    # Candidate no longer standing
+    def test__not_standing(self):
+        """Candidates no longer standing should be dropped from the row and its total weight."""
+        self.assertEqual(
+            self.table.standing_row('A', {'C': 1}),
+            ([('C', 3)], 3)
+        )
+
+
+    # Candidate without a row
+    def test__no_row(self):
+        """No entries and no weight should be returned."""
+        self.assertEqual(self.table.standing_row('C', {'A': 1, 'B': 1}), ([], 0))
+
+
+    # Cached totals after removal
+    def test__remove(self):
+        """Removing a candidate should subtract their weight from every row that lists them."""
+        standing = {'A': 1, 'B': 1, 'C': 1}
+        self.table.sync(standing)
+        self.assertEqual(self.table.totals, {'A': 5, 'B': 10})
+        remaining = {'A': 1, 'B': 1}
+        self.table.remove('C', standing, remaining)
+        self.assertEqual(self.table.totals, {'A': 2, 'B': 5})
+        self.assertEqual(self.table.standing_row('B', remaining), ([('A', 1)], 5))
+
+
+    # Cached totals after an outside change
+    def test__outside_change(self):
+        """Candidates removed without remove() should be picked up by recalculating the totals."""
+        standing = {'A': 1, 'B': 1, 'C': 1}
+        self.table.sync(standing)
+        standing.pop('A')
+        self.assertEqual(self.table.standing_row('B', standing), ([('C', 5)], 9))
+
+
+
+# Count arithmetic tests
+class Arithmetic__Tests(TestCase):
+    """This test class checks the count arithmetic options of DirectElectionEngine."""
+
+    # Test setup
+    def setUp(self):
+        """This method describes an election where B's 10 votes are split three ways."""
+        self.settings = {
+            'votes': {'A': 30, 'B': 10, 'C': 20, 'D': 25},
+            'redistribution_matrix': {'B': {'A': 1, 'C': 1, 'D': 1}}
+        }
+
+
+    # Unknown arithmetic
+    def test__unknown_arithmetic(self):
+        """A ValueError should be raised."""
+        self.assertRaises(
+            ValueError,
+            DirectElectionEngine,
+            ['A'],
+            arithmetic = 'decimal'
+        )
+
+
+    # Fixed-point arithmetic
+    def test__fixed(self):
+        """Tallies should be integers in units of 10^-5 votes, with transfers truncated."""
+        engine = DirectElectionEngine(['A', 'B', 'C', 'D'], arithmetic = 'fixed', **self.settings)
+        self.assertEqual(engine.quota, 4300000)
+        engine.redistribute_votes('B')
+        self.assertEqual(engine.votes[-1], {'A': 3333333, 'C': 2333333, 'D': 2833333})
+        self.assertEqual(engine.arithmetic.to_float(engine.votes[-1]['A']), 33.33333)
+
+
+    # Rational arithmetic
+    def test__fraction(self):
+        """Tallies should be exact fractions."""
+        engine = DirectElectionEngine(['A', 'B', 'C', 'D'], arithmetic = 'fraction', **self.settings)
+        engine.redistribute_votes('B')
+        self.assertEqual(engine.votes[-1], {'A': Fraction(100, 3), 'C': Fraction(70, 3), 'D': Fraction(85, 3)})
+
+
+    # Matching results
+    def test__same_results(self):
+        """All three arithmetic options should elect the same candidates."""
+        elected = []
+        for arithmetic in ('float', 'fixed', 'fraction'):
+            engine = DirectElectionEngine(['A', 'B', 'C', 'D'], seats = 2, arithmetic = arithmetic, **self.settings)
+            engine.run_election()
+            elected.append(engine.elected)
+        self.assertEqual(elected, [['A', 'D']] * 3)
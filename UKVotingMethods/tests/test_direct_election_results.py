@@ -424,3 +424,203 @@ class STV_Election__Tests(TestCase):
         self.assertEqual(election.elected, ['B', 'A'])
         self.assertEqual(election.eliminated, ['C', 'D'])
 
+
+
+
+# Count shortcuts
+class Shortcut_Election__Tests(TestCase):
+    """
+    This test class checks the behaviour of the DirectElectionEngine with bulk exclusion and the last seat shortcut.
+    The same candidates should be elected as without the shortcuts, in fewer voting rounds.
+    """
+
+    # Bulk exclusion of the three lowest candidates
+    def test__bulk_exclusion(self):
+        """
+        Candidates E, D and C should be excluded together, since their 6 votes cannot overtake B.
+        Candidate B should then be eliminated and candidate A elected by default.
+        """
+
+        # Setup election
+        election = DirectElectionEngine(
+            ['A', 'B', 'C', 'D', 'E'],
+            votes = {'A': 40, 'B': 35, 'C': 3, 'D': 2, 'E': 1},
+            redistribution_matrix = {'C': {'B': 1}},
+            bulk_exclusion = True
+        )
+        election.run_election()
+
+        # Test election results
+        self.assertEqual(election.quota, 41)
+        self.assertEqual(election.votes, [
+            {'A': 40, 'B': 35, 'C': 3, 'D': 2, 'E': 1},
+            {'A': 40, 'B': 38},
+            {'A': 40}
+        ])
+        self.assertEqual(election.elected, ['A'])
+        self.assertEqual(election.eliminated, ['E', 'D', 'C', 'B'])
+
+
+    # Bulk exclusion stopped by a winner
+    def test__bulk_exclusion__stopped(self):
+        """
+        Candidate E's votes should take A to the quota, stopping the bulk exclusion.
+        Candidate A should then be elected.
+        """
+
+        # Setup election
+        election = DirectElectionEngine(
+            ['A', 'B', 'C', 'D', 'E'],
+            votes = {'A': 40, 'B': 35, 'C': 3, 'D': 2, 'E': 1},
+            redistribution_matrix = {'E': {'A': 1}},
+            bulk_exclusion = True
+        )
+        election.run_election()
+
+        # Test election results
+        self.assertEqual(election.votes, [
+            {'A': 40, 'B': 35, 'C': 3, 'D': 2, 'E': 1},
+            {'A': 41, 'B': 35, 'C': 3, 'D': 2}
+        ])
+        self.assertEqual(election.elected, ['A'])
+        self.assertEqual(election.eliminated, ['E'])
+
+
+    # Last seat shortcut
+    def test__last_seat_shortcut(self):
+        """
+        Candidate A should be elected on the quota, with their surplus dropped.
+        Candidate B should then take the last seat, having more votes than C and D combined.
+        """
+
+        # Setup election
+        election = DirectElectionEngine(
+            ['A', 'B', 'C', 'D'],
+            seats = 2,
+            votes = {'A': 50, 'B': 30, 'C': 12, 'D': 8},
+            last_seat_shortcut = True
+        )
+        election.run_election()
+
+        # Test election results
+        self.assertEqual(election.quota, 34)
+        self.assertEqual(election.votes, [
+            {'A': 50, 'B': 30, 'C': 12, 'D': 8},
+            {'B': 30, 'C': 12, 'D': 8}
+        ])
+        self.assertEqual(election.elected, ['A', 'B'])
+        self.assertEqual(election.eliminated, [])
+
+
+
+# Surplus method tests
+class Surplus_Method__Tests(TestCase):
+    """This test class checks the Gregory and Meek surplus transfer methods against the default inclusive method."""
+
+    # Gregory method
+    def test__gregory(self):
+        """
+        B is excluded and A elected on B's transfer.
+        The inclusive method shares A's surplus by A's row, electing D, while the Gregory method shares it by B's row (the last parcel), electing E.
+        """
+        options = dict(
+            seats = 2,
+            votes = {'A': 30, 'B': 12, 'D': 28, 'E': 30},
+            redistribution_matrix = {'A': {'D': 1}, 'B': {'A': 10, 'E': 1}}
+        )
+        inclusive = DirectElectionEngine(['A', 'B', 'D', 'E'], **options)
+        inclusive.run_election()
+        self.assertEqual(inclusive.elected, ['A', 'D'])
+        gregory = DirectElectionEngine(['A', 'B', 'D', 'E'], surplus = 'gregory', **options)
+        gregory.run_election()
+        self.assertEqual(gregory.elected, ['A', 'E'])
+        self.assertAlmostEqual(gregory.votes[2]['E'], 38)
+
+
+    # Meek method
+    def test__meek(self):
+        """
+        A is elected and keeps a third of the votes, passing the rest to C.
+        When D is excluded, D's votes pass through A to C, electing C rather than B (the inclusive method drops D's votes, as A is no longer standing).
+        """
+        options = dict(
+            seats = 2,
+            votes = {'A': 40, 'B': 30, 'C': 20, 'D': 10},
+            redistribution_matrix = {'A': {'C': 1}, 'D': {'A': 1}}
+        )
+        inclusive = DirectElectionEngine(['A', 'B', 'C', 'D'], **options)
+        inclusive.run_election()
+        self.assertEqual(inclusive.elected, ['A', 'B'])
+        meek = DirectElectionEngine(['A', 'B', 'C', 'D'], surplus = 'meek', **options)
+        meek.run_election()
+        self.assertEqual(meek.elected, ['A', 'C'])
+        self.assertAlmostEqual(meek.quota, 100/3)
+        self.assertAlmostEqual(meek.votes[2]['C'], 20 + 50 - 100/3)
+
+
+    # Meek method with surpluses between elected candidates
+    def test__meek_elected_transfers(self):
+        """
+        A's surplus elects D, and D's surplus then flows back through A rather than being counted again for B.
+        B ends below the quota of 50.8, so E takes the last seat.
+        """
+        meek = DirectElectionEngine(
+            ['A', 'B', 'D', 'E'],
+            seats = 3,
+            votes = {'A': 150, 'B': 0, 'D': 30, 'E': 52},
+            redistribution_matrix = {'A': {'B': 1, 'D': 1}},
+            surplus = 'meek'
+        )
+        meek.run_election()
+        self.assertEqual(meek.elected, ['A', 'D', 'E'])
+        self.assertAlmostEqual(meek.quota, 50.8, places = 6)
+        self.assertAlmostEqual(meek.votes[-1]['B'], 49.6, places = 6)
+
+
+    # Meek method with a candidate level with the quota
+    def test__meek_on_quota(self):
+        """
+        The quota should be 90/3 = 30, raised by the tolerance, from the first round.
+        A's surplus takes B level with 30, which is not enough to be elected, and B is then excluded on a tie with D (B is listed first).
+        """
+        meek = DirectElectionEngine(
+            ['A', 'B', 'C', 'D'],
+            seats = 2,
+            votes = {'A': 40, 'B': 20, 'C': 15, 'D': 15},
+            redistribution_matrix = {'A': {'B': 1}, 'C': {'D': 1}},
+            surplus = 'meek'
+        )
+        self.assertGreater(meek.quota, 30)
+        self.assertAlmostEqual(meek.quota, 30)
+        meek.run_election()
+        self.assertAlmostEqual(meek.votes[1]['B'], 30)
+        self.assertEqual(meek.eliminated, ['C', 'B'])
+        self.assertEqual(meek.elected, ['A', 'D'])
+
+
+    # Meek method with elected candidates listing each other
+    def test__meek_elected_loop(self):
+        """
+        A and B pass votes only to each other, so once both are elected their surpluses should leave the count rather than circulate between them.
+        The keep values should settle, with the quota falling to 13.5.
+        """
+        meek = DirectElectionEngine(
+            ['A', 'B', 'C', 'D'],
+            seats = 3,
+            votes = {'A': 60, 'B': 20, 'C': 15, 'D': 12},
+            redistribution_matrix = {'A': {'B': 1}, 'B': {'A': 1}},
+            surplus = 'meek'
+        )
+        meek.run_election()
+        self.assertEqual(meek.elected, ['A', 'B', 'C'])
+        self.assertLess(meek.meek.iterations, meek.meek_iterations)
+        self.assertAlmostEqual(meek.quota, 13.5, places = 6)
+
+
+    # Unsupported options
+    def test__invalid(self):
+        """An unknown surplus method, or Meek's method with exact arithmetic, should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            DirectElectionEngine(['A'], surplus = 'hare')
+        with self.assertRaises(ValueError):
+            DirectElectionEngine(['A'], surplus = 'meek', arithmetic = 'fraction')
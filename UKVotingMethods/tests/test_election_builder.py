@@ -0,0 +1,72 @@
+from unittest import TestCase
+from ..election_builder import RedistributionIndex, build_election, constituency_key
+from ..records import Candidate
+
+
+# RedistributionIndex.candidate_matrix() tests
+class Candidate_Matrix__Tests(TestCase):
+    """This test class checks the candidate matrices built from party redistribution data."""
+
+    # Test setup
+    def setUp(self):
+        """This method creates a redistribution index for three parties and a list of candidates."""
+        self.index = RedistributionIndex({
+            'Lab': {'redistribute': {'Lab': 1, 'Grn': 2}, 'aliases': ['Labour']},
+            'Grn': {'redistribute': {'Lab': 1, None: 1}, 'aliases': ['Green']},
+            'Ind': {'aliases': ['Independent']}
+        })
+        self.candidates = [
+            Candidate('A', 'Lab', 12),
+            Candidate('B', 'Grn', 5),
+            Candidate('C', 'Lab', 8),
+            Candidate('D', 'Ind', 3),
+            Candidate('E', 'Other', 1)
+        ]
+
+
+    # Matrix matches candidate-by-candidate construction
+    def test__matches_pairwise(self):
+        """The matrix should match one built by comparing every pair of candidates."""
+        self.assertEqual(
+            self.index.candidate_matrix(self.candidates),
+            {
+                'A': {'A': 1, 'C': 1, 'B': 2},
+                'C': {'A': 1, 'C': 1, 'B': 2},
+                'B': {'A': 1, 'C': 1}
+            }
+        )
+
+
+    # Candidates without redistribution
+    def test__no_redistribution(self):
+        """Candidates from parties without redistribution entries, or unknown parties, should have no row."""
+        matrix = self.index.candidate_matrix(self.candidates)
+        self.assertNotIn('D', matrix)
+        self.assertNotIn('E', matrix)
+
+
+    # Engine construction
+    def test__build_election(self):
+        """The engine should accept the candidates and matrix, with B's votes electing C once A has been elected."""
+        election = build_election(self.candidates, 2, self.index)
+        election.run_election()
+        self.assertEqual(election.quota, 10)
+        self.assertEqual(election.elected, ['A', 'C'])
+
+
+
+# constituency_key() tests
+class Constituency_Key__Tests(TestCase):
+    """This test class checks that constituency names from different sources are matched."""
+
+    # Ampersands and commas
+    def test__ampersand(self):
+        """'&' should match 'and', and commas should be ignored."""
+        self.assertEqual(constituency_key('Birmingham Hall Green'), constituency_key('Birmingham, Hall Green'))
+        self.assertEqual(constituency_key('Barrow & Furness'), constituency_key('Barrow and Furness'))
+
+
+    # Word order
+    def test__word_order(self):
+        """Reordered names should match."""
+        self.assertEqual(constituency_key('Chester, City of'), constituency_key('City of Chester'))
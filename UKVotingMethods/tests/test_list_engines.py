@@ -0,0 +1,66 @@
+from unittest import TestCase
+from ..list_engines import AdditionalMemberEngine, HighestAveragesEngine, party_tallies
+from ..records import Candidate, ConstituencyResult
+
+
+# Example party votes
+VOTES = {'C': 30000, 'A': 100000, 'D': 20000, 'B': 80000}
+
+
+
+# HighestAveragesEngine tests
+class Highest_Averages__Tests(TestCase):
+    """This test class checks highest averages seat allocations against worked examples."""
+
+    # D'Hondt
+    def test__dhondt(self):
+        """Eight seats should be split 4, 3, 1, 0, awarded in the order of the largest quotients."""
+        election = HighestAveragesEngine(VOTES, 8)
+        election.run_election()
+        self.assertEqual(election.allocation, {'A': 4, 'B': 3, 'C': 1, 'D': 0})
+        self.assertEqual(election.elected, ['A', 'B', 'A', 'B', 'A', 'C', 'B', 'A'])
+
+
+    # Sainte-Laguë
+    def test__sainte_lague(self):
+        """Eight seats should be split 3, 3, 1, 1."""
+        election = HighestAveragesEngine(VOTES, 8, 'sainte-lague')
+        election.run_election()
+        self.assertEqual(election.allocation, {'A': 3, 'B': 3, 'C': 1, 'D': 1})
+
+
+    # Initial seats and thresholds
+    def test__initial_seats(self):
+        """A party's initial seats should lower its averages, and parties under the threshold should win nothing."""
+        election = HighestAveragesEngine(VOTES, 4, initial_seats = {'A': 3}, threshold = 0.1)
+        election.run_election()
+        self.assertEqual(election.allocation, {'A': 3, 'B': 3, 'C': 1})
+
+
+    # Unknown method
+    def test__unknown_method(self):
+        """An unrecognised method should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            HighestAveragesEngine(VOTES, 8, 'hare')
+
+
+
+# AdditionalMemberEngine tests
+class Additional_Member__Tests(TestCase):
+    """This test class checks Additional Member System counts for a region."""
+
+    # Top-up seats
+    def test__top_up(self):
+        """
+        Lab wins both constituencies, but with 45% of the regional vote to Con's 40%, so Con should take the first two list seats and Lab the third.
+        """
+        constituencies = [
+            ConstituencyResult('North', [Candidate('A', 'Lab', 500), Candidate('B', 'Con', 400), Candidate('C', 'LD', 100)]),
+            ConstituencyResult('South', [Candidate('D', 'Lab', 400), Candidate('E', 'Con', 400), Candidate('F', 'LD', 200)])
+        ]
+        self.assertEqual(party_tallies(constituencies[0].candidates + constituencies[1].candidates), {'Lab': 900, 'Con': 800, 'LD': 300})
+        election = AdditionalMemberEngine(constituencies, 3)
+        election.run_election()
+        self.assertEqual(election.constituency_winners, {'North': Candidate('A', 'Lab', 500), 'South': Candidate('D', 'Lab', 400)})
+        self.assertEqual(election.list_engine.elected, ['Con', 'Con', 'Lab'])
+        self.assertEqual(election.allocation, {'Lab': 3, 'Con': 2, 'LD': 0})
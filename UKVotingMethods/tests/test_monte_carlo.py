@@ -0,0 +1,62 @@
+from unittest import TestCase
+import numpy
+from ..election_builder import RedistributionIndex, build_election
+from ..monte_carlo import RedistributionSampler, seat_distribution, simulate_seats, spread_priors
+from ..records import Candidate
+
+
+# Example parties and group
+PARTIES = {
+    'Lab': {'redistribute': {'Lab': 1}},
+    'Con': {'redistribute': {'Con': 1}},
+    'LD': {'redistribute': {'Lab': 0.6, 'Con': 0.4}},
+    'Ind': {}
+}
+CANDIDATES = [
+    Candidate('A', 'Lab', 400), Candidate('B', 'Lab', 150),
+    Candidate('C', 'Con', 420), Candidate('D', 'Con', 100),
+    Candidate('E', 'LD', 180), Candidate('F', 'Ind', 60), Candidate('G', 'Other', 30)
+]
+
+
+
+# RedistributionSampler tests
+class Sampler__Tests(TestCase):
+    """This test class checks the redistribution weights drawn by RedistributionSampler."""
+
+    # Dirichlet draws
+    def test__sample(self):
+        """Parties with a prior should have weights summing to one, and parties without one should keep their point estimate."""
+        priors = spread_priors(PARTIES)
+        del priors['Con']
+        weights = RedistributionSampler(PARTIES, priors, seed = 1).sample(50)
+        self.assertTrue(numpy.allclose(weights[:, 0].sum(axis = 1), 1))
+        self.assertTrue((weights[:, 1, 1] == 1).all())
+        self.assertFalse(weights[:, 3].any())
+
+
+
+# simulate_seats tests
+class Simulation__Tests(TestCase):
+    """This test class checks Monte Carlo simulations against the deterministic count."""
+
+    # Point estimates
+    def test__point_estimates(self):
+        """Without priors, every scenario should elect the same parties as DirectElectionEngine."""
+        election = build_election(CANDIDATES, 2, RedistributionIndex(PARTIES))
+        election.run_election()
+        party_of = {candidate.name: candidate.party for candidate in CANDIDATES}
+        expected = [party_of[name] for name in election.elected]
+        labels, seats_won = simulate_seats([(CANDIDATES, 2)], RedistributionSampler(PARTIES), 5, batch_size = 2, workers = 0)
+        for party in labels:
+            self.assertTrue((seats_won[:, labels.index(party)] == expected.count(party)).all())
+
+
+    # Seat distributions
+    def test__distribution(self):
+        """Seat probabilities should sum to one for each party, and two seats should be won in every scenario."""
+        sampler = RedistributionSampler(PARTIES, spread_priors(PARTIES, 2, 1), seed = 0)
+        labels, seats_won = simulate_seats([(CANDIDATES, 2)], sampler, 200, batch_size = 64, workers = 0)
+        self.assertTrue((seats_won.sum(axis = 1) == 2).all())
+        for summary in seat_distribution(labels, seats_won).values():
+            self.assertAlmostEqual(sum(summary['probabilities'].values()), 1)
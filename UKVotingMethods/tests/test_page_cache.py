@@ -0,0 +1,81 @@
+from tempfile import TemporaryDirectory
+import os
+from ..page_cache import PageCache
+from .stub_server import Stub_Handler, Stub_Server_Test_Case
+
+
+# Stub page server
+class Page_Handler(Stub_Handler):
+    """This request handler serves a page with an ETag, answering matching conditional requests with 304 Not Modified."""
+    requests = []
+    body = 'version 1'
+
+    def do_GET(self):
+        Page_Handler.requests.append((self.path, self.headers.get('If-None-Match')))
+        etag = '"{}"'.format(Page_Handler.body)
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_body(Page_Handler.body + self.path, {'ETag': etag})
+
+
+
+# PageCache tests
+class Page_Cache__Tests(Stub_Server_Test_Case):
+    """This test class checks the on-disk page cache against a local stub server."""
+    handler = Page_Handler
+
+    # Test setup
+    def setUp(self):
+        """This method creates an empty cache in a temporary directory."""
+        self.directory = TemporaryDirectory()
+        self.cache = PageCache(self.directory.name)
+        Page_Handler.requests = []
+        Page_Handler.body = 'version 1'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+    # Unchanged page
+    def test__revalidation(self):
+        """The second fetch should send the stored ETag and use the cached copy on a 304 response."""
+        self.assertEqual(self.cache.fetch(self.base_url + 'page'), 'version 1/page')
+        self.assertEqual(self.cache.fetch(self.base_url + 'page'), 'version 1/page')
+        self.assertEqual(Page_Handler.requests, [('/page', None), ('/page', '"version 1"')])
+
+
+    # Changed page
+    def test__changed_page(self):
+        """A changed page should be downloaded again and replace the cached copy."""
+        self.cache.fetch(self.base_url + 'page')
+        Page_Handler.body = 'version 2'
+        self.assertEqual(self.cache.fetch(self.base_url + 'page'), 'version 2/page')
+        self.assertEqual(self.cache.read(self.base_url + 'page'), 'version 2/page')
+
+
+    # Offline use
+    def test__no_revalidation(self):
+        """With revalidation off, cached pages should be used without any request."""
+        self.cache.fetch(self.base_url + 'page')
+        offline = PageCache(self.directory.name, revalidate = False)
+        self.assertEqual(offline.fetch(self.base_url + 'page'), 'version 1/page')
+        self.assertEqual(len(Page_Handler.requests), 1)
+
+
+    # Size-bounded eviction
+    def test__eviction(self):
+        """The least recently used pages should be removed once the cache is over its size limit."""
+        self.cache.store('first', 'a' * 10)
+        size = self.cache.total_size
+        self.cache.max_bytes = 2 * size
+        self.cache.store('second', 'b' * 10)
+        os.utime(self.cache.path('first') + '.html.gz', (0, 0))
+        os.utime(self.cache.path('second') + '.html.gz', (1, 1))
+        self.cache.read('first')
+        self.cache.store('third', 'c' * 10)
+        self.assertEqual(self.cache.read('first'), 'a' * 10)
+        self.assertIsNone(self.cache.read('second'))
+        self.assertIsNone(self.cache.metadata('second'))
+        self.assertEqual(self.cache.read('third'), 'c' * 10)
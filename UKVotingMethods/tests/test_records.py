@@ -0,0 +1,125 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+import os
+from ..records import Candidate, ConstituencyResult, ResultsCheckpoint, ResultsStore, RoundResult, convert_lines_to_results, load_results, write_results_lines
+from ..voting_engines import DirectElectionEngine
+
+
+# Results file conversion tests
+class Conversion__Tests(TestCase):
+    """This test class checks that records convert to and from the results file format."""
+
+    # Round trip
+    def test__round_trip(self):
+        """A constituency should be unchanged by converting to records and back."""
+        data = [
+            {'name': 'A', 'party': 'Lab', 'votes': 100},
+            {'name': 'B', 'party': 'Con', 'votes': 80}
+        ]
+        result = ConstituencyResult.from_list('Somewhere', data)
+        self.assertEqual(result.candidates, [Candidate('A', 'Lab', 100), Candidate('B', 'Con', 80)])
+        self.assertEqual(result.to_list(), data)
+
+
+    # No instance dictionaries
+    def test__slots(self):
+        """Records should not carry a per-instance dictionary."""
+        self.assertFalse(hasattr(Candidate('A', 'Lab', 100), '__dict__'))
+
+
+
+# DirectElectionEngine.rounds tests
+class Round_Results__Tests(TestCase):
+    """This test class checks the round records kept by DirectElectionEngine.run_election()."""
+
+    # Alternative vote count
+    def test__rounds(self):
+        """Candidate C should be eliminated in round 1 and candidate A elected in round 2."""
+        election = DirectElectionEngine(
+            ['A', 'B', 'C'],
+            votes = {'A': 40, 'B': 45, 'C': 15},
+            redistribution_matrix = {'C': {'A': 1}}
+        )
+        election.run_election()
+        self.assertEqual(election.rounds, [
+            RoundResult(1, [], ['C']),
+            RoundResult(2, ['A'], [])
+        ])
+
+
+
+# ResultsCheckpoint tests
+class Checkpoint__Tests(TestCase):
+    """This test class checks that results checkpoints survive being reopened, including after an interrupted write."""
+
+    # Resume
+    def test__resume(self):
+        """Results recorded before closing should be loaded on reopening, and a half-written line dropped."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            first = ConstituencyResult('First', [Candidate('A', 'Lab', 100)])
+            second = ConstituencyResult('Second', [Candidate('B', 'Con', 80)])
+
+            # Record one result and simulate a crash part-way through the next
+            with ResultsCheckpoint(path) as checkpoint:
+                checkpoint.append(first)
+            with open(path, 'a', encoding = 'utf-8') as file:
+                file.write('["Second", [{"name": "B"')
+
+            # Reopen and finish
+            with ResultsCheckpoint(path) as checkpoint:
+                self.assertIn('First', checkpoint)
+                self.assertNotIn('Second', checkpoint)
+                checkpoint.append(second)
+            with ResultsCheckpoint(path) as checkpoint:
+                self.assertEqual(checkpoint.results, {'First': first, 'Second': second})
+
+
+    # Missing newline
+    def test__missing_newline(self):
+        """A line cut off just before its newline should be dropped, so the next result is not appended to it."""
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            first = ConstituencyResult('First', [Candidate('A', 'Lab', 100)])
+            second = ConstituencyResult('Second', [Candidate('B', 'Con', 80)])
+            third = ConstituencyResult('Third', [Candidate('C', 'LD', 60)])
+
+            # Record two results and simulate a crash before the second newline
+            with ResultsCheckpoint(path) as checkpoint:
+                checkpoint.append(first)
+                checkpoint.append(second)
+            with open(path, 'rb+') as file:
+                file.truncate(os.path.getsize(path) - 1)
+
+            # Reopen and finish
+            with ResultsCheckpoint(path) as checkpoint:
+                self.assertEqual(checkpoint.results, {'First': first})
+                checkpoint.append(second)
+                checkpoint.append(third)
+            with ResultsCheckpoint(path) as checkpoint:
+                self.assertEqual(checkpoint.results, {'First': first, 'Second': second, 'Third': third})
+
+
+
+# Results lines tests
+class Results_Lines__Tests(TestCase):
+    """This test class checks that results lines files can be read back by constituency and converted to results files."""
+
+    # Seeking single constituencies
+    def test__store(self):
+        """Constituencies should be read back individually, in file order, and unchanged by converting back to a results file."""
+        results = {
+            name: ConstituencyResult(name, [Candidate(name + ' A', 'Lab', 100 + i), Candidate(name + ' B', 'Con', 80)])
+            for i, name in enumerate(['Oxford East', 'Ynys Môn', 'Banbury'])
+        }
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.jsonl')
+            write_results_lines(results, path)
+            with ResultsStore(path) as store:
+                self.assertEqual(store.names(), list(results))
+                self.assertEqual(store['Ynys Môn'], results['Ynys Môn'])
+                self.assertEqual(list(store.load(['Banbury', 'Oxford East'])), ['Oxford East', 'Banbury'])
+                with self.assertRaises(KeyError):
+                    store['Nowhere']
+            convert_lines_to_results(path, os.path.join(directory, 'results.json'))
+            self.assertEqual(load_results(os.path.join(directory, 'results.json')), results)
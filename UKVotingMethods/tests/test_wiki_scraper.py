@@ -0,0 +1,125 @@
+from tempfile import TemporaryDirectory
+from time import monotonic
+from unittest import TestCase
+from bs4 import FeatureNotFound
+from ..page_cache import PageCache
+from ..records import Candidate
+from ..wiki_scraper import PARSERS, PartyAliases, get_constituency_results, get_many_constituency_results, parse_cached_constituency_results, parse_constituency_results, parse_page
+from .stub_server import Stub_Handler, Stub_Server_Test_Case
+
+
+# Stub constituency page
+PAGE = """<html><body><table>
+<caption><a href="/wiki/United_Kingdom_general_election,_2015">General election 2015</a>: {name}</caption>
+<tr class="vcard"><td></td><td class="org"><a>Labour</a></td><td class="fn"><a>{name} Candidate</a></td><td>{votes}</td></tr>
+<tr class="vcard"><td></td><td class="org"><a>Conservative</a></td><td class="fn"><a>{name} Runner-up</a></td><td>1,000</td></tr>
+</table></body></html>"""
+
+
+# Stub page server
+class Constituency_Handler(Stub_Handler):
+    """This request handler serves a constituency page for any path, using the path as the constituency name."""
+
+    def do_GET(self):
+        name = self.path.strip('/')
+        self.send_body(PAGE.format(name = name, votes = '{:,}'.format(1000 + len(name))), {'Content-Type': 'text/html; charset=utf-8'})
+
+
+
+# Scraper tests against a local server
+class Scraper__Tests(Stub_Server_Test_Case):
+    """This test class checks the constituency scrapers against a local stub server, so no network access is needed."""
+    handler = Constituency_Handler
+
+
+    # Single page
+    def test__single_page(self):
+        """The candidates should be read from the results table, with parties matched to their codes."""
+        candidates = get_constituency_results(
+            self.base_url + 'Oxford',
+            2015,
+            {'Lab': {'aliases': ['Labour']}, 'Con': {'aliases': ['Conservative']}}
+        )
+        self.assertEqual(candidates, [
+            Candidate('Oxford Candidate', 'Lab', 1006),
+            Candidate('Oxford Runner-up', 'Con', 1000)
+        ])
+
+
+    # Many pages at once
+    def test__many_pages(self):
+        """Every page should be scraped, with results returned in the order requested."""
+        page_urls = [self.base_url + 'Place{}'.format(i) for i in range(20)]
+        results = list(get_many_constituency_results(page_urls, 2015, workers = 4))
+        self.assertEqual([page_url for page_url, candidates in results], page_urls)
+        for page_url, candidates in results:
+            self.assertEqual(candidates[0].name, page_url.split('/')[-1] + ' Candidate')
+
+
+    # Rate limit
+    def test__rate_limit(self):
+        """Five requests at 20 per second should take at least 0.2 seconds."""
+        start = monotonic()
+        list(get_many_constituency_results([self.base_url + 'Place'] * 5, 2015, workers = 5, rate = 20))
+        self.assertGreaterEqual(monotonic() - start, 0.19)
+
+
+
+# Parser backend tests
+class Parser__Tests(TestCase):
+    """This test class checks that every parser backend reads the same candidates from a page."""
+
+    # Backend agreement
+    def test__backends_agree(self):
+        """Every installed backend should give the same candidates as the default html.parser backend."""
+        text = PAGE.format(name = 'Oxford', votes = '2,000')
+        expected = parse_constituency_results(parse_page(text), 2015)
+        for parser in PARSERS:
+            with self.subTest(parser = parser):
+                try:
+                    soup = parse_page(text, parser)
+                except FeatureNotFound:
+                    self.skipTest('{} is not installed'.format(parser))
+                self.assertEqual(parse_constituency_results(soup, 2015), expected)
+
+
+    # Unknown backend
+    def test__unknown_parser(self):
+        """An unrecognised parser name should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            parse_page(PAGE, 'not-a-parser')
+
+
+
+# Party alias tests
+class Party_Aliases__Tests(TestCase):
+    """This test class checks the matching of party names to party codes."""
+
+    # Normalised matching
+    def test__resolve(self):
+        """Names should match their aliases regardless of case and spacing, and unknown names should be left unchanged."""
+        aliases = PartyAliases({'Lab': {'aliases': ['Labour', 'Labour Co-op']}, 'Ind': {'aliases': ['Independent']}, 'Other': {}})
+        self.assertEqual(
+            aliases.resolve_all(['Labour', ' labour\xa0 co-op', 'INDEPENDENT', 'Monster Raving Loony', 'Labour']),
+            ['Lab', 'Lab', 'Ind', 'Monster Raving Loony', 'Lab']
+        )
+
+
+
+# Cached page parsing tests
+class Cached_Parsing__Tests(TestCase):
+    """This test class checks the parsing of cached pages across worker processes."""
+
+    # Parse-only mode
+    def test__parse_cached(self):
+        """Cached pages should be parsed in the order given, and a page missing from the cache should raise a KeyError."""
+        with TemporaryDirectory() as directory:
+            cache = PageCache(directory)
+            page_urls = ['http://example.org/Place{}'.format(i) for i in range(5)]
+            for i, page_url in enumerate(page_urls):
+                cache.store(page_url, PAGE.format(name = 'Place{}'.format(i), votes = '{:,}'.format(2000 + i)))
+            results = list(parse_cached_constituency_results(page_urls, 2015, cache, {'Lab': {'aliases': ['Labour']}}, workers = 2, chunk_size = 2))
+            self.assertEqual([page_url for page_url, candidates in results], page_urls)
+            self.assertEqual(results[3][1][0], Candidate('Place3 Candidate', 'Lab', 2003))
+            with self.assertRaises(KeyError):
+                list(parse_cached_constituency_results(['http://example.org/Missing'], 2015, cache))
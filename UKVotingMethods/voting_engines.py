@@ -1,7 +1,429 @@
-from operator import itemgetter as tuple_index
+from heapq import heapify, heappush, heappop
 from copy import copy
+from fractions import Fraction
 from math import floor
 
+import numpy
+
+from .records import RoundResult
+
+
+# Count arithmetic
+class FloatArithmetic():
+    """
+    This class provides the default count arithmetic, where transferred votes are calculated with float division.
+    Tallies can drift by rounding errors, so very close results may depend on the order of calculations.
+    """
+
+    def votes(self, votes):
+        """This method converts a number of votes into a tally value."""
+        return votes
+
+    def weight(self, weight):
+        """This method converts a redistribution weight into the form used for transfers."""
+        return weight
+
+    def transfer(self, votes, weight, total_weight):
+        """This method returns the share of 'votes' carried by 'weight' out of 'total_weight'."""
+        return votes * weight/total_weight
+
+    def to_float(self, value):
+        """This method converts a tally value back into a number of votes."""
+        return float(value)
+
+
+class FixedPointArithmetic(FloatArithmetic):
+    """
+    This class provides scaled-integer count arithmetic, as used by the Scottish STV rules.
+    Tallies are held as integers in units of 10^-places votes, weights are rounded to the same number of places, and every transfer is truncated, so the count is exact and reproducible.
+    """
+
+    def __init__(self, places = 5):
+        self.scale = 10**places
+
+    def votes(self, votes):
+        return round(votes * self.scale)
+
+    def weight(self, weight):
+        return round(weight * self.scale)
+
+    def transfer(self, votes, weight, total_weight):
+        return votes * weight // total_weight
+
+    def to_float(self, value):
+        return value / self.scale
+
+
+class FractionArithmetic(FloatArithmetic):
+    """
+    This class provides exact rational count arithmetic using Fraction tallies and weights.
+    No votes are lost to rounding, but the count is much slower than the float and fixed-point arithmetic.
+    """
+
+    def votes(self, votes):
+        return Fraction(votes)
+
+    def weight(self, weight):
+        return Fraction(weight)
+
+
+ARITHMETIC = {
+    'float': FloatArithmetic,
+    'fixed': FixedPointArithmetic,
+    'fraction': FractionArithmetic
+}
+
+
+# Ranked tallies
+class TallyRanking():
+    """
+    This class maintains maximum and minimum heaps over the tallies of a voting round, so that the leading and trailing candidates can be found without sorting every round.
+    Heap entries are invalidated lazily: an entry is only trusted while its candidate is still in the tallies with the same number of votes.
+    Ties are broken in favour of the candidate listed first in the tallies, which matches a stable sort of the tallies.
+    Every change to a tally must be reported through update(): a candidate whose only heap entries are out of date is dropped from the ranking.
+    """
+
+    # Initialisation routine
+    def __init__(self, tallies):
+        """
+        This method builds the heaps from a dictionary of tallies.
+
+        Required Parameters
+        ------
+        tallies: dict <candidate: int>
+            The votes for each candidate in the current round.
+        """
+        self.tallies = tallies
+        self.order = {candidate: index for index, candidate in enumerate(tallies)}
+        self.max_heap = [(-votes, self.order[candidate], candidate) for candidate, votes in tallies.items()]
+        self.min_heap = [(votes, self.order[candidate], candidate) for candidate, votes in tallies.items()]
+        heapify(self.max_heap)
+        heapify(self.min_heap)
+
+
+    # Tallies rebinding
+    def rebind(self, tallies):
+        """
+        This method points the ranking at a new tallies dictionary, such as a copy made for the next voting round.
+        The new tallies must hold the same votes as the old ones for the existing heap entries to remain valid.
+        """
+        self.tallies = tallies
+
+
+    # Tally update
+    def update(self, candidate):
+        """This method records a change to a candidate's tally, leaving any older heap entries to be discarded lazily."""
+        votes = self.tallies[candidate]
+        heappush(self.max_heap, (-votes, self.order[candidate], candidate))
+        heappush(self.min_heap, (votes, self.order[candidate], candidate))
+
+
+    # Leading candidate
+    def leader(self):
+        """This method returns the candidate with the most votes and their tally, or (None, None) if there are no candidates left."""
+        while self.max_heap:
+            votes, _, candidate = self.max_heap[0]
+            if candidate in self.tallies and self.tallies[candidate] == -votes:
+                return candidate, -votes
+            heappop(self.max_heap)
+        return None, None
+
+
+    # Trailing candidate
+    def trailer(self):
+        """This method returns the candidate with the fewest votes and their tally, or (None, None) if there are no candidates left."""
+        while self.min_heap:
+            votes, _, candidate = self.min_heap[0]
+            if candidate in self.tallies and self.tallies[candidate] == votes:
+                return candidate, votes
+            heappop(self.min_heap)
+        return None, None
+
+
+# Sparse redistribution rows
+class TransferTable():
+    """
+    This class holds a redistribution matrix in a compressed sparse row layout, built once when the matrix is added to an election.
+    The 'to' candidates and weights of every row are stored in two flat lists, with each 'from' candidate mapped to its slice, and the weights to 'None' are kept in a separate column.
+    Renormalising a row over the candidates still standing only touches that row's entries, rather than every candidate in the count.
+    The total weight of each row over the standing candidates is cached, and decremented through a reverse index whenever a candidate leaves the count.
+    """
+
+    # Initialisation routine
+    def __init__(self, matrix, arithmetic = FloatArithmetic()):
+        """
+        This method compresses a redistribution matrix.
+
+        Required Parameters
+        ------
+        matrix: dict <candidate: dict <candidate: int> >
+            The redistribution matrix, which may include 'None' as a 'to' key.
+
+        Optional Parameters
+        ------
+        arithmetic: FloatArithmetic (default = FloatArithmetic())
+            The count arithmetic, used to convert the weights.
+        """
+
+        # Compress rows
+        self.rows = {}
+        self.targets = []
+        self.weights = []
+        self.to_none = {}
+        for from_key, row in matrix.items():
+            start = len(self.targets)
+            for to_key, weight in row.items():
+                if to_key is None:
+                    self.to_none[from_key] = arithmetic.weight(weight)
+                else:
+                    self.targets.append(to_key)
+                    self.weights.append(arithmetic.weight(weight))
+            self.rows[from_key] = (start, len(self.targets))
+
+        # Index rows by 'to' candidate
+        self.sources = {}
+        for from_key, (start, end) in self.rows.items():
+            for i in range(start, end):
+                self.sources.setdefault(self.targets[i], []).append((from_key, self.weights[i]))
+
+        # Prepare total weight cache
+        self.totals = None
+        self.standing = None
+        self.standing_count = None
+
+
+    # Total weight cache
+    def sync(self, standing):
+        """
+        This method recalculates the total weight of every row over the standing candidates, unless the cache already matches them.
+        The cache is matched by the identity and size of the standing candidates' dictionary, so changes made outside remove() are picked up here.
+        """
+        if self.totals is not None and self.standing is standing and self.standing_count == len(standing):
+            return
+        self.totals = {}
+        for from_key, (start, end) in self.rows.items():
+            self.totals[from_key] = self.to_none.get(from_key, 0) + sum(
+                self.weights[i] for i in range(start, end) if self.targets[i] in standing
+            )
+        self.standing = standing
+        self.standing_count = len(standing)
+
+
+    # Candidate removal
+    def remove(self, candidate, previous_standing, standing):
+        """
+        This method updates the cached totals when a candidate leaves the count, by subtracting their weight from each row that lists them.
+        The previous and new standing candidates' dictionaries may be the same object (when the votes history is updated in place) or a copy.
+        """
+        if self.totals is None or self.standing is not previous_standing or self.standing_count != len(standing) + 1:
+            self.sync(standing)
+            return
+        for from_key, weight in self.sources.get(candidate, []):
+            self.totals[from_key] -= weight
+        self.standing = standing
+        self.standing_count = len(standing)
+
+
+    # Standing row lookup
+    def standing_row(self, from_key, standing):
+        """
+        This method returns the (candidate, weight) entries of a row for the candidates still standing, along with the row's total weight including 'None'.
+        Candidates without a row return no entries, so their votes are dropped.
+        """
+        if from_key not in self.rows:
+            return [], 0
+        self.sync(standing)
+        start, end = self.rows[from_key]
+        entries = [(self.targets[i], self.weights[i]) for i in range(start, end) if self.targets[i] in standing]
+        return entries, self.totals[from_key]
+
+
+
+# Meek keep-value count
+class MeekCount():
+    """
+    This class calculates the tallies for Meek's method of surplus transfer over a redistribution matrix.
+    Every elected candidate keeps a fraction (their keep value) of the votes reaching them and passes the rest on through their matrix row to the hopeful candidates and to the candidates elected after them.
+    Excluded candidates pass on all their votes to the hopeful and elected candidates, so elected candidates go on receiving transfers. Any weight to 'None' leaves the count.
+    (A matrix has no memory of where a vote has been, so votes only pass between elected candidates in order of election; otherwise two elected candidates of the same party would pass votes back and forth without ever reaching the quota.)
+    For a given set of keep values the votes reaching each candidate solve a linear system, so each iteration is a single array solve rather than a walk of the transfers.
+    Keep values are then scaled towards the quota (recalculated from the votes still in the count) until every elected candidate keeps the quota within 'tolerance', or 'max_iterations' is reached.
+    The quota is the votes still in the count divided by one more than the number of seats, raised by 'tolerance' of itself (see meek_quota()), so a candidate level with the exact Droop share is not elected.
+    Keep values are carried between rounds, so later rounds start close to the answer.
+    """
+
+    # Initialisation routine
+    def __init__(self, votes, matrix, seats, tolerance = 1e-9, max_iterations = 500):
+        """
+        This method builds the arrays for the count.
+
+        Required Parameters
+        ------
+        votes: dict <candidate: int>
+            The first-round votes for each candidate.
+        matrix: dict <candidate: dict <candidate: int> >
+            The redistribution matrix, which may include 'None' as a 'to' key.
+        seats: int
+            The number of seats to be elected.
+
+        Optional Parameters
+        ------
+        tolerance: float (default = 1e-9)
+            The largest allowed difference between an elected candidate's kept votes and the quota, as a fraction of the quota.
+        max_iterations: int (default = 500)
+            The largest number of keep value updates in a single round.
+        """
+        self.index = list(votes)
+        self.position = {candidate: i for i, candidate in enumerate(self.index)}
+        self.first = numpy.array([votes[candidate] for candidate in self.index], dtype = float)
+        self.seats = seats
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+        # Build weight arrays
+        self.weights = numpy.zeros((len(self.index), len(self.index)))
+        self.to_none = numpy.zeros(len(self.index))
+        for from_key, row in matrix.items():
+            if from_key not in self.position:
+                continue
+            for to_key, weight in row.items():
+                if to_key is None:
+                    self.to_none[self.position[from_key]] = weight
+                elif to_key in self.position and to_key != from_key:
+                    self.weights[self.position[from_key], self.position[to_key]] = weight
+
+        # Prepare keep values
+        self.keep = numpy.ones(len(self.index))
+        self.iterations = 0
+
+
+    # Quota
+    @staticmethod
+    def meek_quota(votes, seats, tolerance):
+        """This method returns the quota for a number of votes still in the count: votes/(seats+1), plus 'tolerance' times that so that a candidate level with it (to within the precision of the count) is not elected."""
+        return votes/(seats + 1) * (1 + tolerance)
+
+
+    # Count solver
+    def solve(self, hopeful, elected):
+        """
+        This method finds the keep values for the elected candidates and returns the votes of each hopeful candidate, along with the quota.
+        The number of keep value updates used is left in 'iterations'.
+        """
+        hopeful_mask = numpy.array([candidate in hopeful for candidate in self.index])
+        elected_mask = numpy.array([candidate in elected for candidate in self.index])
+
+        # Share rows over the hopeful candidates and the candidates elected later (excluded rows reach every elected candidate)
+        elected_order = numpy.array([elected.index(candidate) if candidate in elected else -1 for candidate in self.index])
+        receiving = hopeful_mask[None, :] | (elected_mask[None, :] & (elected_order[None, :] > elected_order[:, None]))
+        weights = self.weights * receiving
+        totals = weights.sum(axis = 1) + self.to_none
+        weights = numpy.divide(weights, totals[:, None], out = numpy.zeros_like(weights), where = totals[:, None] != 0)
+
+        # Iterate keep values
+        identity = numpy.eye(len(self.index))
+        for iteration in range(1, self.max_iterations + 1):
+            passed = numpy.where(elected_mask, 1 - self.keep, numpy.where(hopeful_mask, 0, 1))
+            arriving = numpy.linalg.solve(identity - (weights * passed[:, None]).T, self.first)
+            kept = numpy.where(elected_mask, self.keep * arriving, numpy.where(hopeful_mask, arriving, 0))
+            quota = self.meek_quota(kept.sum(), self.seats, self.tolerance)
+            if not elected_mask.any() or numpy.abs(kept - quota)[elected_mask].max() <= self.tolerance * quota:
+                break
+            scale = numpy.divide(quota, kept, out = numpy.ones_like(kept), where = kept > 0)
+            self.keep[elected_mask] = numpy.minimum(1, self.keep[elected_mask] * scale[elected_mask])
+        self.iterations = iteration
+
+        return {candidate: float(arriving[self.position[candidate]]) for candidate in hopeful}, quota
+
+
+
+# Round-by-round vote history
+class VoteHistory():
+    """
+    This class stores the votes for each voting round as changes from the previous round, rather than as full copies.
+    Only the first round and the latest round are held in full, and the latest round is the live dictionary updated by the election engine.
+    Earlier rounds are reconstructed on demand by replaying the changes, so the history can still be indexed and compared like a list of dictionaries.
+    """
+
+    # Initialisation routine
+    def __init__(self, votes):
+        """
+        This method creates a history from the first-round votes.
+
+        Required Parameters
+        ------
+        votes: dict <candidate: int>
+            The first-round votes for each candidate.
+        """
+        self.first = copy(votes)
+        self.current = copy(votes)
+        self.changes = []
+
+
+    # Round advancement
+    def advance(self, candidate_to_go):
+        """This method starts a new voting round by removing a candidate from the live votes."""
+        self.current.pop(candidate_to_go)
+        self.changes.append(([candidate_to_go], {}))
+
+
+    # Removal within a round
+    def remove(self, candidate_to_go):
+        """This method removes a further candidate from the live votes during the latest round, as in a bulk exclusion."""
+        self.current.pop(candidate_to_go)
+        removed, changed = self.changes[-1]
+        removed.append(candidate_to_go)
+        changed.pop(candidate_to_go, None)
+
+
+    # Change recording
+    def record(self, candidates):
+        """This method records the current votes of the given candidates as the changes made during the latest round."""
+        changed = self.changes[-1][1]
+        for candidate in candidates:
+            changed[candidate] = self.current[candidate]
+
+
+    # Round reconstruction
+    def __getitem__(self, index):
+        """
+        This method returns the votes for a single round, or a list of rounds for a slice.
+        The latest round is returned as the live dictionary, while earlier rounds are rebuilt as new dictionaries.
+        """
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError('Voting round out of range')
+        if index == len(self) - 1:
+            return self.current
+
+        round_votes = copy(self.first)
+        for removed, changed in self.changes[:index]:
+            for candidate_to_go in removed:
+                round_votes.pop(candidate_to_go)
+            round_votes.update(changed)
+        return round_votes
+
+
+    # List-like behaviour
+    def __len__(self):
+        return len(self.changes) + 1
+
+    def __iter__(self):
+        round_votes = copy(self.first)
+        for removed, changed in self.changes:
+            yield copy(round_votes)
+            for candidate_to_go in removed:
+                round_votes.pop(candidate_to_go)
+            round_votes.update(changed)
+        yield self.current
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
 
 # Election engine base
 class DirectElectionEngine():
@@ -16,7 +438,7 @@ class DirectElectionEngine():
     """
 
     # Initialisation routine
-    def __init__(self, candidates, seats = 1, votes = [], redistribution_matrix = {}):
+    def __init__(self, candidates, seats = 1, votes = [], redistribution_matrix = {}, history = 'full', arithmetic = 'float', bulk_exclusion = False, last_seat_shortcut = False, surplus = 'inclusive', meek_tolerance = 1e-9, meek_iterations = 500):
         """
         This method creates an election engine from inputs representing the number of seats and the list of candidates.
 
@@ -33,6 +455,23 @@ class DirectElectionEngine():
             The first-round votes for each candidate.
         redistribution_matrix: dict <candidate: dict <candidate: int> >
             The redistribution matrix for all candidates.
+        history: str (default = 'full')
+            How the votes for each round are kept: 'full' stores a copy of every round, while 'deltas' stores only the changes between rounds (see VoteHistory).
+        arithmetic: str (default = 'float')
+            The arithmetic used for the count: 'float', 'fixed' (integer tallies in units of 10^-5 votes) or 'fraction' (exact rational tallies).
+        bulk_exclusion: bool (default = False)
+            Whether to exclude, in a single round, all the lowest candidates whose combined votes cannot overtake the next candidate.
+        last_seat_shortcut: bool (default = False)
+            Whether to elect the leading candidate for the last seat as soon as they have more votes than all the other candidates combined.
+        surplus: str (default = 'inclusive')
+            How an elected candidate's surplus is transferred:
+                'inclusive' shares the surplus by the elected candidate's own matrix row,
+                'gregory' shares only the last parcel of votes that elected them (at most the surplus), each part by the matrix row it arrived through,
+                'meek' uses Meek's method, where elected candidates keep a fraction of every vote reaching them and the quota falls as votes leave the count (see MeekCount). It needs float arithmetic, and uses the quota from MeekCount.meek_quota() from the first round.
+        meek_tolerance: float (default = 1e-9)
+            How close each elected candidate's kept votes must come to the quota in Meek's method, as a fraction of the quota.
+        meek_iterations: int (default = 500)
+            The largest number of keep value updates per round in Meek's method.
         """
         # This method is untested because it's behaviour is trivial #
 
@@ -40,6 +479,31 @@ class DirectElectionEngine():
         self.candidates = candidates
         self.seats = seats
 
+        # Read history mode
+        if history not in ('full', 'deltas'):
+            raise ValueError('History mode not recognised: "{}"'.format(history))
+        self.history = history
+
+        # Read count arithmetic
+        if arithmetic not in ARITHMETIC:
+            raise ValueError('Arithmetic not recognised: "{}"'.format(arithmetic))
+        self.arithmetic = ARITHMETIC[arithmetic]()
+
+        # Read count shortcuts
+        self.bulk_exclusion = bulk_exclusion
+        self.last_seat_shortcut = last_seat_shortcut
+
+        # Read surplus method
+        if surplus not in ('inclusive', 'gregory', 'meek'):
+            raise ValueError('Surplus method not recognised: "{}"'.format(surplus))
+        if surplus == 'meek' and arithmetic != 'float':
+            raise ValueError('Meek\'s method needs float arithmetic')
+        self.surplus = surplus
+        self.meek_tolerance = meek_tolerance
+        self.meek_iterations = meek_iterations
+        self.parcels = {}
+        self.meek = None
+
         # Process votes input
         self.votes = []
         if votes:
@@ -47,26 +511,35 @@ class DirectElectionEngine():
 
         # Process redistribution matrix input
         self.redistribution_matrix = {}
+        self.transfers = TransferTable({}, self.arithmetic)
         if redistribution_matrix:
             self.add_redistribution_matrix(redistribution_matrix)
 
 
         # Prepare output containers
+        self.ranking = None
         self.elected = []
         self.eliminated = []
+        self.rounds = []
 
 
     # Vote initialisation
     def add_votes(self, votes):
         """
         This method processes the initial votes and any spoilt ballots.
-        It then calculates the voting quota using the Droop method.
+        It then calculates the voting quota using the Droop method (or with Meek's method, MeekCount.meek_quota()).
         """
+        candidates = set(self.candidates)
         for key in votes:
-            if not key in self.candidates:
+            if not key in candidates:
                 raise ValueError('Write-in candidates are not supported')
-        self.votes = [votes]
-        self.quota = floor(sum(votes.values())/(self.seats+1))+1
+        if self.surplus == 'meek':
+            self.quota = MeekCount.meek_quota(sum(votes.values()), self.seats, self.meek_tolerance)
+        else:
+            self.quota = self.arithmetic.votes(floor(sum(votes.values())/(self.seats+1))+1)
+        if type(self.arithmetic) is not FloatArithmetic:
+            votes = {candidate: self.arithmetic.votes(votes[candidate]) for candidate in votes}
+        self.votes = VoteHistory(votes) if self.history == 'deltas' else [votes]
 
 
     # Redistribution matrix initialisation
@@ -78,17 +551,19 @@ class DirectElectionEngine():
         """
 
         # Check 'from' keys are valid
+        candidates = set(self.candidates)
         for from_key in matrix:
-            if not from_key in self.candidates:
+            if not from_key in candidates:
                 raise ValueError('From-candidate not recognised: "{}"'.format(from_key))
 
             # Check 'to' keys are valid
             for to_key in matrix[from_key]:
-                if not to_key in self.candidates and to_key is not None:
+                if not to_key in candidates and to_key is not None:
                     raise ValueError('To-candidate not recognised: "{}"'.format(to_key))
 
         # Add matrix to engine
         self.redistribution_matrix = matrix
+        self.transfers = TransferTable(matrix, self.arithmetic)
 
 
     # Main routine
@@ -96,11 +571,14 @@ class DirectElectionEngine():
         """
         This method is the main election routine.
         It calls single_voting_round() repeatedly until all seats are filled or the number of iterations excedes the number of candidates (whichever is first).
+        The candidates elected and eliminated in each round are recorded in 'rounds'.
         """
 
         # Loop over voting rounds
         for i in range(0, len(self.candidates)):
+            elected, eliminated = len(self.elected), len(self.eliminated)
             complete = self.single_voting_round()
+            self.rounds.append(RoundResult(i + 1, self.elected[elected:], self.eliminated[eliminated:]))
             if complete:
                 break
 
@@ -110,8 +588,10 @@ class DirectElectionEngine():
         """
         This method performs a single round of voting by performing the following steps:
             1. Test for "default winners", where the number of remaining seats equals the number of remaining candidates.
-            2. Try to find a "winner" who has the most votes and more votes than the quota.
-            3. Eliminate the "loser" with the fewest votes.
+            2. Optionally, elect the leader for the last seat if they have more votes than all other candidates combined.
+            3. Try to find a "winner" who has the most votes and more votes than the quota.
+            4. Eliminate the "loser" with the fewest votes, or with bulk exclusion, every loser who cannot overtake the next candidate.
+        Winners and losers are found from the tally ranking carried between rounds (see ranked_winner() and ranked_loser()).
         """
 
         # Get votes for the round
@@ -122,8 +602,15 @@ class DirectElectionEngine():
             self.elected.extend(round_votes.keys())
             return True
 
+        # Last seat shortcut
+        if self.last_seat_shortcut and self.seats - len(self.elected) == 1:
+            leader, votes = self.get_ranking(round_votes).leader()
+            if votes > sum(round_votes.values()) - votes:
+                self.elected.append(leader)
+                return True
+
         # Elect winner
-        winner = self.find_winner(round_votes)
+        winner = self.ranked_winner()
         if winner:
             self.elected.append(winner)
             if self.seats == len(self.elected):
@@ -134,61 +621,150 @@ class DirectElectionEngine():
             )
             return False
 
-        # Eliminate loser
-        loser = self.find_loser(round_votes)
-        self.eliminated.append(loser)
-        self.redistribute_votes(loser)
+        # Eliminate losers
+        losers = self.count_excludable(round_votes) if self.bulk_exclusion else 1
+        for i in range(losers):
+            loser = self.ranked_loser()
+            self.eliminated.append(loser)
+            self.redistribute_votes(loser, new_round = i == 0)
+
+            # Stop early if a transfer reaches the quota
+            if self.ranked_winner():
+                break
+
+
+    # Bulk exclusion method
+    def count_excludable(self, round_votes):
+        """
+        This method returns how many of the lowest candidates can be excluded together, because their combined votes are fewer than the votes of the next candidate.
+        Enough candidates are always kept to fill the remaining seats, and at least one candidate is excluded.
+        Since the excluded candidates are still removed lowest-first and the bulk stops if anyone reaches the quota, the result is the same as excluding them one round at a time.
+        """
+        ranked_votes = sorted(round_votes.values())
+        excludable = 1
+        combined_votes = 0
+        for i in range(len(ranked_votes) - (self.seats - len(self.elected))):
+            combined_votes += ranked_votes[i]
+            if i + 1 < len(ranked_votes) and combined_votes < ranked_votes[i + 1]:
+                excludable = i + 1
+        return excludable
+
+
+    # Ranking access method
+    def get_ranking(self, round_votes):
+        """
+        This method returns the tally ranking for the given round, building a new one if the current ranking belongs to a different set of tallies.
+        Rankings are carried forward between rounds by redistribute_votes(), so they are normally only built once per election.
+        """
+        if self.ranking is None or self.ranking.tallies is not round_votes:
+            self.ranking = TallyRanking(round_votes)
+        return self.ranking
+
+
+    # Ranked winner and loser methods
+    def ranked_winner(self):
+        """
+        This method returns the winner of the latest round in the same way as find_winner(), but from the tally ranking rather than a scan of every tally.
+        It relies on the latest round's votes only being changed by redistribute_votes(), which keeps the ranking up to date.
+        """
+        winner, votes = self.get_ranking(self.votes[-1]).leader()
+        return winner if winner is not None and votes >= self.quota else None
+
+    def ranked_loser(self):
+        """This method returns the loser of the latest round in the same way as find_loser(), but from the tally ranking."""
+        return self.get_ranking(self.votes[-1]).trailer()[0]
 
 
     # Find winner method
     def find_winner(self, round_votes):
         """
-        This method sorts the remaining candidates by the number of votes received and returns the candidate with the most votes that excedes the vote quota.
-        If no candidate excedes the vote quota, a None value is returned.
+        This method returns the candidate with the most votes, provided they meet the vote quota.
+        If no candidate meets the vote quota, a None value is returned.
+        Ties are broken in favour of the candidate listed first.
         """
-        ranked_votes = sorted(
-            round_votes.items(),
-            key = tuple_index(1),
-            reverse = True
-        )
-        return ranked_votes[0][0] if ranked_votes[0][1] >= self.quota else None
+        winner = max(round_votes, key = round_votes.get, default = None)
+        return winner if winner is not None and round_votes[winner] >= self.quota else None
 
 
     # Find loser method
     def find_loser(self, round_votes):
-        """This method sorts the remaining candidates by the number of votes received and returns the candidate with the least votes."""
-        ranked_votes = sorted(
-            round_votes.items(),
-            key = tuple_index(1),
-            reverse = False
-        )
-        return ranked_votes[0][0]
+        """This method returns the candidate with the fewest votes, breaking ties in favour of the candidate listed first."""
+        return min(round_votes, key = round_votes.get, default = None)
 
 
     # Redistribute votes method
-    def redistribute_votes(self, candidate_to_go, votes_to_share = False):
+    def redistribute_votes(self, candidate_to_go, votes_to_share = False, new_round = True):
         """
         This method removes a candidate from the voting and redistributes their votes amongst the remaining candidates according to the redistribution matrix.
         By default, all their votes will be distributed, but this can changed by specifying 'votes_to_share'.
         Any votes redistributed to 'None' are removed from the election.
+        The votes are normally moved into a new voting round, but 'new_round' can be turned off to update the latest round instead (as in a bulk exclusion).
         """
 
         # Advance voting round
-        self.votes.append(copy(self.votes[-1]))
-        self.votes[-1].pop(candidate_to_go)
+        previous_votes = self.votes[-1]
+        votes_to_go = previous_votes[candidate_to_go]
+        if not new_round:
+            if isinstance(self.votes, VoteHistory):
+                self.votes.remove(candidate_to_go)
+            else:
+                previous_votes.pop(candidate_to_go)
+        elif isinstance(self.votes, VoteHistory):
+            self.votes.advance(candidate_to_go)
+        else:
+            self.votes.append(copy(previous_votes))
+            self.votes[-1].pop(candidate_to_go)
+        round_votes = self.votes[-1]
+        if self.ranking is not None and self.ranking.tallies is previous_votes:
+            self.ranking.rebind(round_votes)
+        self.transfers.remove(candidate_to_go, previous_votes, round_votes)
 
         # Redistribute votes
-        if candidate_to_go in self.redistribution_matrix:
+        changed = self.transfer_votes(candidate_to_go, votes_to_go, votes_to_share if votes_to_share else votes_to_go, round_votes)
+        if self.ranking is not None and self.ranking.tallies is round_votes:
+            for candidate in changed:
+                self.ranking.update(candidate)
+
+        # Record changes
+        if isinstance(self.votes, VoteHistory):
+            self.votes.record(changed)
 
-            # Get updated redistribution array
-            new_redist = {None: self.redistribution_matrix[candidate_to_go][None]} if None in self.redistribution_matrix[candidate_to_go] else {}
-            for candidate in self.votes[-1]:
-                if candidate in self.redistribution_matrix[candidate_to_go]:
-                    new_redist[candidate] = self.redistribution_matrix[candidate_to_go][candidate]
 
-            # Redistribute votes:
-            total_weight = sum(new_redist.values())
-            new_redist.pop(None, None)
-            for candidate in new_redist:
-                self.votes[-1][candidate] += (votes_to_share if votes_to_share else self.votes[-2][candidate_to_go]) * new_redist[candidate]/total_weight
+    # Transfer votes method
+    def transfer_votes(self, candidate_to_go, votes_to_go, votes_to_share, round_votes):
+        """
+        This method adds the 'votes_to_share' of a departing candidate (who had 'votes_to_go' in total) to the remaining candidates in 'round_votes', according to the redistribution matrix.
+        With the Gregory surplus method, an elected candidate's surplus is taken from their last parcel of votes only, each part shared by the row it arrived through.
+        With Meek's method, the votes of every remaining candidate are recalculated instead (see MeekCount).
+        It returns the candidates whose votes were changed.
+        """
 
+        # Meek's method
+        if self.surplus == 'meek':
+            if self.meek is None:
+                self.meek = MeekCount(self.votes[0], self.redistribution_matrix, self.seats, self.meek_tolerance, self.meek_iterations)
+            meek_votes, self.quota = self.meek.solve(round_votes, self.elected)
+            round_votes.update(meek_votes)
+            return list(round_votes)
+
+        # Find parcel of votes to share
+        parcel = {candidate_to_go: votes_to_go}
+        if self.surplus == 'gregory' and candidate_to_go in self.elected:
+            parcel = self.parcels.get(candidate_to_go, parcel)
+            parcel_votes = sum(parcel.values())
+            votes_to_share = min(votes_to_share, parcel_votes)
+
+        # Share votes by row
+        received = {}
+        for origin, origin_votes in parcel.items():
+            share = votes_to_share if len(parcel) == 1 else self.arithmetic.transfer(votes_to_share, origin_votes, parcel_votes)
+            entries, total_weight = self.transfers.standing_row(origin, round_votes)
+            for candidate, weight in entries:
+                amount = self.arithmetic.transfer(share, weight, total_weight) if total_weight else 0
+                round_votes[candidate] += amount
+                received.setdefault(candidate, {})[origin] = amount
+
+        # Record parcels for the Gregory method
+        if self.surplus == 'gregory':
+            self.parcels.update(received)
+        return list(received)
@@ -1,20 +1,135 @@
-from requests import get as get_request
-from bs4 import BeautifulSoup as Soup
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, sleep
+from requests import Session, get as get_request
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup as Soup, SoupStrainer
 import re
 
+from .page_cache import read_page_file
+from .records import Candidate
+
+
+# Parser backends
+PARSERS = {
+    'html.parser': ('html.parser', None),
+    'html.parser-tables': ('html.parser', SoupStrainer('table')),
+    'lxml': ('lxml', None),
+    'lxml-tables': ('lxml', SoupStrainer('table'))
+}
+
+
+# Page parser
+def parse_page(text, parser = 'html.parser'):
+    """
+    This method parses a page with one of the backends in PARSERS.
+    The '-tables' backends only build the page's tables, which hold everything the results scrapers look at, and skip the rest of the page.
+    The 'lxml' backends need the optional lxml package.
+    """
+    if parser not in PARSERS:
+        raise ValueError('Parser not recognised: "{}"'.format(parser))
+    features, strainer = PARSERS[parser]
+    return Soup(text, features, parse_only = strainer)
+
+
+# Party alias resolution
+class PartyAliases():
+    """
+    This class maps the party names found on results pages to party codes, using the 'aliases' entries of the parties data.
+    The alias lookup is built once and shared by every page of a scrape, with names normalised for case and whitespace before matching.
+    Names that match no alias are returned unchanged.
+    """
+    
+    def __init__(self, parties):
+        self.lookup = {}
+        for code in parties:
+            for alias in parties[code].get('aliases', []):
+                self.lookup[self.normalise(alias)] = code
+    
+    @staticmethod
+    def normalise(name):
+        """This method reduces a party name to lower case with single spaces, so that "Labour  Co-op" and "labour co-op" match."""
+        return ' '.join(name.split()).casefold()
+    
+    def resolve(self, name):
+        """This method returns the party code for a single party name."""
+        return self.lookup.get(self.normalise(name), name)
+    
+    def resolve_all(self, names):
+        """This method returns the party codes for a list of party names, normalising each distinct name once."""
+        codes = {name: self.resolve(name) for name in set(names)}
+        return [codes[name] for name in names]
+
+
+def party_aliases(parties):
+    """This method returns a PartyAliases for the given parties data, which may already be a PartyAliases or None."""
+    if parties is None or isinstance(parties, PartyAliases):
+        return parties
+    return PartyAliases(parties)
+
+
+def resolve_parties(candidates, parties):
+    """This method replaces the party names of a list of Candidate records with party codes, in one batch."""
+    aliases = party_aliases(parties)
+    if aliases:
+        for candidate, code in zip(candidates, aliases.resolve_all([candidate.party for candidate in candidates])):
+            candidate.party = code
+    return candidates
+
+
+# Constituency list parser
+def get_constituency_pages(soup):
+    """
+    This method reads the constituency page links from a parsed results-by-constituency list page.
+    A dictionary of page url to constituency name is returned, in the order of the list.
+    """
+    pages = {}
+    table = soup.find('table', class_='wikitable')
+    for row in table.findChildren('tr'):
+        
+        # Skip header and bottom rows
+        if row.get('valign') or row.get('class'):
+            continue
+        
+        # Get constituency
+        constituency_anchor = row.findChild('td').findChild('a')
+        pages['https://en.wikipedia.org' + constituency_anchor.get('href')] = str(constituency_anchor.contents[0])
+    return pages
+
+
+# Page fetcher
+def fetch_page(page_url, session = None, cache = None):
+    """
+    This method downloads a page and returns its text.
+    A requests session can be given to reuse its connections, and a PageCache to keep (and revalidate) local copies of pages.
+    """
+    if cache:
+        return cache.fetch(page_url, session)
+    request = session.get(page_url) if session else get_request(page_url)
+    request.raise_for_status()
+    return request.text
+
 
 # Primary constituency results scraper
-def get_constituency_results(page_url, year, parties = None):
+def get_constituency_results(page_url, year, parties = None, session = None, cache = None, parser = 'html.parser'):
     """
     This method is the main constituency results scraper.
     The constituency page url and election year must be provided.
-    A list of dictionaries containing candiate names, parties, and vote tallies is returned.
+    'parties' can be the parties data or a PartyAliases built from it, to match party names to party codes.
+    A list of Candidate records containing candiate names, parties, and vote tallies is returned.
     """
     
     # Get page as soup
-    request = get_request(page_url)
-    request.raise_for_status()
-    soup = Soup(request.text, 'html.parser')
+    soup = parse_page(fetch_page(page_url, session, cache), parser)
+    return parse_constituency_results(soup, year, parties)
+
+
+# Constituency results parser
+def parse_constituency_results(soup, year, parties = None):
+    """
+    This method finds the results table for the given year in a parsed constituency page.
+    A list of Candidate records containing candiate names, parties, and vote tallies is returned.
+    """
     
     # Find results table
     election_table = False
@@ -33,10 +148,98 @@ def get_constituency_results(page_url, year, parties = None):
     for candidate in election_table.findChildren('tr', class_='vcard'):
         
         # Add candidate to list
-        candidates.append(get_candidate_from_row(candidate, 3, parties))
+        candidates.append(get_candidate_from_row(candidate, 3))
     
-    # Return candidates
-    return candidates
+    # Return candidates with party codes
+    return resolve_parties(candidates, parties)
+
+
+# Request rate limiter
+class RateLimiter():
+    """
+    This class spaces out requests shared between threads, so that no more than 'rate' requests are started each second.
+    A rate of None places no limit on requests.
+    """
+    
+    def __init__(self, rate = None):
+        self.interval = 1/rate if rate else 0
+        self.next_time = 0
+        self.lock = Lock()
+    
+    def wait(self):
+        """This method blocks until the next request is allowed to start."""
+        with self.lock:
+            now = monotonic()
+            start_time = max(now, self.next_time)
+            self.next_time = start_time + self.interval
+        sleep(max(0, start_time - now))
+
+
+# Concurrent constituency results scraper
+def get_many_constituency_results(page_urls, year, parties = None, workers = 8, rate = None, cache = None, parser = 'html.parser'):
+    """
+    This method scrapes many constituency pages at once using a pool of threads and a shared keep-alive session.
+    'workers' sets the number of pages fetched at the same time and 'rate' limits the number of requests started each second, to stay polite to the server.
+    Pages can be kept in a PageCache, in which case only new or changed pages are downloaded.
+    (page_url, candidates) pairs are yielded in the same order as the urls are given, as soon as each is available.
+    """
+    
+    # Prepare shared session and party lookup
+    parties = party_aliases(parties)
+    session = Session()
+    adapter = HTTPAdapter(pool_connections = 1, pool_maxsize = workers)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    limiter = RateLimiter(rate)
+    
+    # Fetch and parse a single page
+    def scrape(page_url):
+        limiter.wait()
+        return page_url, get_constituency_results(page_url, year, parties, session, cache, parser)
+    
+    # Scrape pages across threads
+    with session, ThreadPoolExecutor(max_workers = workers) as executor:
+        for result in executor.map(scrape, page_urls):
+            yield result
+
+
+# Cached page parsing worker
+def parse_cached_constituency_page(path, page_url, year, parties, parser):
+    """This method reads and parses a single cached constituency page in a worker process, returning a (page_url, candidates) pair."""
+    return page_url, parse_constituency_results(parse_page(read_page_file(path), parser), year, parties)
+
+
+# Parallel cached constituency results parser
+def parse_cached_constituency_results(page_urls, year, cache, parties = None, workers = None, parser = 'html.parser', chunk_size = 8):
+    """
+    This method parses constituency pages already held in a PageCache, without any network access, spreading the parsing across a pool of processes.
+    Parsing is CPU-bound, so separate processes scale with the number of processors where threads would be held back by the GIL.
+    'workers' sets the number of processes (by default the number of processors) and 'chunk_size' the number of pages sent to a process at a time.
+    A KeyError is raised for any page missing from the cache.
+    (page_url, candidates) pairs are yielded in the same order as the urls are given, as soon as each is available.
+    """
+    
+    # Find cached page files
+    page_urls = list(page_urls)
+    paths = []
+    for page_url in page_urls:
+        if cache.metadata(page_url) is None:
+            raise KeyError('Page not cached: {}'.format(page_url))
+        paths.append(cache.path(page_url))
+    
+    # Parse pages across processes
+    parties = party_aliases(parties)
+    with ProcessPoolExecutor(max_workers = workers) as executor:
+        for result in executor.map(
+            parse_cached_constituency_page,
+            paths,
+            page_urls,
+            [year] * len(paths),
+            [parties] * len(paths),
+            [parser] * len(paths),
+            chunksize = chunk_size
+        ):
+            yield result
 
 
 # Alternative constituency results scraper
@@ -44,7 +247,7 @@ def alternative_constituency_results(soup, year, parties = None):
     """
     This method scrapes election results from the alternative layout.
     The election year must be provided.
-    A list of dictionaries containing candiate names, parties, and vote tallies is returned.
+    A list of Candidate records containing candiate names, parties, and vote tallies is returned.
     """
     
     # Find links to main election page...
@@ -71,18 +274,19 @@ def alternative_constituency_results(soup, year, parties = None):
     # Loop over candidate rows
     for row in rows[start_index:start_index+row_span]:
         vote_index = 6 if row == rows[start_index] else 3
-        candidates.append(get_candidate_from_row(row, vote_index, parties))
+        candidates.append(get_candidate_from_row(row, vote_index))
     
-    # Return candidates
-    return candidates
+    # Return candidates with party codes
+    return resolve_parties(candidates, parties)
 
 
 # Candidate scraper
-def get_candidate_from_row(row, vote_index, parties):
+def get_candidate_from_row(row, vote_index, parties = None):
     """
     This method takes a table row and extracts the candidate name, party, and vote tally.
     The name must be in a cell with class "fn" and the party must be in a cell with class "org".
     The vote tally cell must be specified.
+    If 'parties' is given the party name is matched to its party code, but scrapers reading a whole table should resolve all of its parties at once with resolve_parties().
     """
     
     # Get candidate name
@@ -99,9 +303,7 @@ def get_candidate_from_row(row, vote_index, parties):
         party = party.findChild('a')
     party = str(party.contents[0])
     if parties:
-        for party_to_match in parties:
-            if party in parties[party_to_match]['aliases']:
-                party = party_to_match
+        party = party_aliases(parties).resolve(party)
     
     # Get votes
     votes = row.findChildren('td')[vote_index]
@@ -111,10 +313,6 @@ def get_candidate_from_row(row, vote_index, parties):
     votes = re.sub(',', '', votes)
     votes = int(votes)
     
-    # Return candidate dictionary
-    return {
-        'name': name,
-        'party': party,
-        'votes': votes
-    }
+    # Return candidate record
+    return Candidate(name, party, votes)
 
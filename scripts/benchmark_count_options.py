@@ -0,0 +1,62 @@
+from time import perf_counter
+import json
+
+from UKVotingMethods.election_builder import RedistributionIndex, build_election, constituency_key
+from UKVotingMethods.records import load_results
+
+
+# Settings
+REPEATS = 5
+
+
+# Values compared for each engine option (the first is the baseline)
+OPTION_VALUES = {
+    'arithmetic': ('float', 'fixed', 'fraction'),
+    'surplus': ('inclusive', 'gregory', 'meek')
+}
+
+
+# Load settings and data
+with open('./data/parties.json', encoding = 'utf-8') as file:
+    redistribution = RedistributionIndex(json.load(file))
+with open('./data/groups.json', encoding = 'utf-8') as file:
+    groups = json.load(file)
+results = {constituency_key(name): result for name, result in load_results('./data/results_2015.json').items()}
+
+
+# Get candidates for each group
+tasks = []
+for group in groups:
+    candidates = []
+    for const in group['constituencies']:
+        candidates.extend(results[constituency_key(const)].candidates)
+    tasks.append((candidates, len(group['constituencies'])))
+
+
+## Time national counts
+# Loop over options and their values
+for option, values in OPTION_VALUES.items():
+    print('{}:'.format(option))
+    baseline = None
+    for value in values:
+        timings = []
+        for i in range(REPEATS):
+            start = perf_counter()
+            elected = []
+            for candidates, seats in tasks:
+                election = build_election(candidates, seats, redistribution, **{option: value})
+                election.run_election()
+                elected.append(sorted(election.elected))
+            timings.append(perf_counter() - start)
+
+        # Compare with baseline results
+        if baseline is None:
+            baseline = elected
+        differences = sum(1 for a, b in zip(baseline, elected) if a != b)
+        print('  {:<10} best {:.3f}s  mean {:.3f}s  groups differing from {}: {}'.format(
+            value,
+            min(timings),
+            sum(timings)/len(timings),
+            values[0],
+            differences
+        ))
@@ -0,0 +1,50 @@
+from time import perf_counter
+import json
+
+from UKVotingMethods.election_builder import RedistributionIndex, build_election, constituency_key
+from UKVotingMethods.monte_carlo import RedistributionSampler, simulate_seats, spread_priors
+from UKVotingMethods.records import ResultsStore
+
+
+# Settings
+SCENARIOS = 2000
+BATCH_SIZES = (100, 1000)
+WORKER_COUNTS = (0, 2, None)  # 0 runs in this process, None uses every processor
+
+
+# Main routine
+if __name__ == '__main__':
+
+    # Load settings and data
+    with open('./data/parties.json', encoding = 'utf-8') as file:
+        parties = json.load(file)
+    with open('./data/groups.json', encoding = 'utf-8') as file:
+        groups = json.load(file)
+    with ResultsStore('./data/results_2015.jsonl') as store:
+        stored = {constituency_key(name): name for name in store.names()}
+        tasks = []
+        for group in groups:
+            candidates = []
+            for const in group['constituencies']:
+                candidates.extend(store[stored[constituency_key(const)]].candidates)
+            tasks.append((candidates, len(group['constituencies'])))
+
+    # Time one deterministic national count for comparison
+    redistribution = RedistributionIndex(parties)
+    start = perf_counter()
+    for candidates, seats in tasks:
+        build_election(candidates, seats, redistribution).run_election()
+    elapsed = perf_counter() - start
+    print('{:<30} {:>10.0f} group counts/s'.format('DirectElectionEngine', len(tasks)/elapsed))
+
+    # Time simulations
+    sampler = RedistributionSampler(parties, spread_priors(parties), seed = 0)
+    for workers in WORKER_COUNTS:
+        for batch_size in BATCH_SIZES:
+            start = perf_counter()
+            simulate_seats(tasks, sampler, SCENARIOS, batch_size, workers)
+            elapsed = perf_counter() - start
+            print('{:<30} {:>10.0f} group counts/s'.format(
+                'workers {}, batch {}'.format(workers, batch_size),
+                SCENARIOS*len(tasks)/elapsed
+            ))
@@ -0,0 +1,50 @@
+from time import perf_counter
+import json
+
+from bs4 import FeatureNotFound
+
+from UKVotingMethods.page_cache import PageCache
+from UKVotingMethods.wiki_scraper import PARSERS, PartyAliases, parse_constituency_results, parse_page
+
+
+# Settings
+CACHE = PageCache('./cache', revalidate = False)  # Pages stored by the scrape scripts
+YEAR = 2015
+
+
+# Load parties list
+with open('./data/parties.json', encoding = 'utf-8') as file:
+    parties = PartyAliases(json.load(file))
+
+
+# Load stored pages
+pages = []
+for _, _, path in CACHE.pages():
+    with open(path + '.json', encoding = 'utf-8') as file:
+        url = json.load(file)['url']
+    pages.append((url, CACHE.read(url)))
+print('Pages: {}'.format(len(pages)))
+
+
+## Time parser backends
+# Loop over backends
+baseline = {}
+for parser in PARSERS:
+    start = perf_counter()
+    results = {}
+    try:
+        for url, text in pages:
+            try:
+                results[url] = parse_constituency_results(parse_page(text, parser), YEAR, parties)
+            except (LookupError, AttributeError):
+                results[url] = None
+    except FeatureNotFound:
+        print('{:<20} not installed'.format(parser))
+        continue
+    elapsed = perf_counter() - start
+
+    # Compare with the default backend
+    if not baseline:
+        baseline = results
+    differences = sum(1 for url in results if results[url] != baseline[url])
+    print('{:<20} {:.2f}s  pages differing from html.parser: {}'.format(parser, elapsed, differences))
@@ -0,0 +1,31 @@
+import json
+import tracemalloc
+
+from UKVotingMethods.records import ConstituencyResult
+
+
+# Memory measurement
+def measure(load):
+    """This function returns the memory still allocated after loading the results, in bytes."""
+    tracemalloc.start()
+    results = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, results
+
+
+# Load raw text once so that only the parsed results are measured
+with open('./data/results_2015.json', encoding = 'utf-8') as file:
+    text = file.read()
+
+
+## Compare representations
+dict_size, dicts = measure(lambda: json.loads(text))
+record_size, records = measure(lambda: {
+    name: ConstituencyResult.from_list(name, candidates)
+    for name, candidates in json.loads(text).items()
+})
+candidates = sum(len(result.candidates) for result in records.values())
+print('Constituencies: {}, candidates: {}'.format(len(records), candidates))
+print('Dictionaries: {:.2f} MB'.format(dict_size/2**20))
+print('Records:      {:.2f} MB ({:.0%} of dictionaries)'.format(record_size/2**20, record_size/dict_size))
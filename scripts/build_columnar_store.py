@@ -0,0 +1,25 @@
+import os
+import re
+
+from UKVotingMethods.columnar_store import ColumnarStore, write_columnar_store
+from UKVotingMethods.records import load_results
+
+
+# Settings
+DIRECTORY = './data/columns'  # Columnar store, holding every election found in ./data
+
+
+# Load every results file
+elections = {}
+for name in sorted(os.listdir('./data')):
+    match = re.match(r'results_(\d+)\.json$', name)
+    if match:
+        elections[int(match.group(1))] = load_results(os.path.join('./data', name))
+
+
+# Write columnar store
+write_columnar_store(DIRECTORY, elections)
+store = ColumnarStore(DIRECTORY)
+for year in store.years():
+    election = store.election(year)
+    print('{}: {} constituencies, {} candidates'.format(year, len(election), len(election.votes)))
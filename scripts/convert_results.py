@@ -0,0 +1,11 @@
+from UKVotingMethods.records import convert_results_to_lines
+
+
+# Settings
+SOURCE = './data/results_2015.json'
+DESTINATION = './data/results_2015.jsonl'  # Index written alongside as results_2015.jsonl.index
+
+
+# Convert results file
+convert_results_to_lines(SOURCE, DESTINATION)
+print('Written {}'.format(DESTINATION))
@@ -0,0 +1,49 @@
+from time import perf_counter
+import json
+import os
+
+from UKVotingMethods.ballot_generator import BallotWriter, generate_ballots
+from UKVotingMethods.election_builder import RedistributionIndex, constituency_key
+from UKVotingMethods.records import ResultsStore
+
+
+# Settings
+DIRECTORY = './ballots'  # One ballot file per group
+SEED = None  # Set for repeatable ballots
+MAX_DEPTH = None  # Largest number of preferences per ballot
+CHUNK_SIZE = 100000  # Distinct ballots per file chunk
+
+
+# Load settings and data
+with open('./data/parties.json', encoding = 'utf-8') as file:
+    redistribution = RedistributionIndex(json.load(file))
+with open('./data/groups.json', encoding = 'utf-8') as file:
+    groups = json.load(file)
+store = ResultsStore('./data/results_2015.jsonl')
+stored = {constituency_key(name): name for name in store.names()}
+os.makedirs(DIRECTORY, exist_ok = True)
+
+
+## Generate ballots
+# Loop over voting groups
+ballots = 0
+distinct = 0
+start = perf_counter()
+for group in groups:
+    candidates = []
+    for const in group['constituencies']:
+        candidates.extend(store[stored[constituency_key(const)]].candidates)
+    votes = {candidate.name: candidate.votes for candidate in candidates}
+
+    # Stream ballots to file
+    with BallotWriter(os.path.join(DIRECTORY, '{}.ballots'.format(group['tag'])), list(votes), CHUNK_SIZE) as writer:
+        for preferences, count in generate_ballots(votes, redistribution.candidate_matrix(candidates), SEED, MAX_DEPTH):
+            writer.write(preferences, count)
+            distinct += 1
+    ballots += writer.ballots
+store.close()
+
+
+# Print throughput
+elapsed = perf_counter() - start
+print('{} ballots ({} distinct) in {:.1f}s: {:.0f} ballots/s'.format(ballots, distinct, elapsed, ballots/elapsed))
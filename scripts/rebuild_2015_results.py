@@ -0,0 +1,34 @@
+import json
+
+from UKVotingMethods.page_cache import PageCache
+from UKVotingMethods.records import ConstituencyResult, write_results_lines
+from UKVotingMethods.wiki_scraper import PartyAliases, fetch_page, get_constituency_pages, parse_cached_constituency_results, parse_page
+
+
+# Settings
+WORKERS = None  # Parsing processes, defaults to the number of processors
+PARSER = 'html.parser-tables'  # Parser backend (see scripts/benchmark_parsers.py)
+CACHE = PageCache('./cache', revalidate = False)  # Pages stored by scripts/scrape_2015_results.py
+
+
+# Main routine
+if __name__ == '__main__':
+
+    # Get parties list
+    with open('./data/parties.json', encoding = 'utf-8') as file:
+        parties = PartyAliases(json.load(file))
+
+    # Get constituency pages from the cached list page
+    page = fetch_page('https://en.wikipedia.org/wiki/Results_of_the_United_Kingdom_general_election,_2015_by_parliamentary_constituency', cache = CACHE)
+    pages = get_constituency_pages(parse_page(page, PARSER))
+
+    # Parse cached pages across processes
+    results = {}
+    for page_url, candidates in parse_cached_constituency_results(pages, 2015, CACHE, parties, workers = WORKERS, parser = PARSER):
+        results[pages[page_url]] = ConstituencyResult(pages[page_url], candidates)
+    print('Parsed {} constituencies'.format(len(results)))
+
+    # Write data to file
+    with open('./data/results_2015.json', 'w+') as file:
+        json.dump({name: result.to_list() for name, result in results.items()}, file)
+    write_results_lines(results, './data/results_2015.jsonl')
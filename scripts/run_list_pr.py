@@ -0,0 +1,52 @@
+import json
+
+from UKVotingMethods.election_builder import constituency_key
+from UKVotingMethods.list_engines import AdditionalMemberEngine, HighestAveragesEngine, party_tallies
+from UKVotingMethods.records import ResultsStore
+
+
+# Settings
+SYSTEM = 'dhondt'  # 'dhondt', 'sainte-lague' or 'ams'
+LIST_RATIO = 56/73  # AMS list seats per constituency (as in the Scottish Parliament)
+AMS_METHOD = 'dhondt'  # Highest averages method for the AMS list seats
+THRESHOLD = 0  # Smallest regional vote share needed to win list seats
+
+
+# Load data, grouping constituencies by region (Scotland, Wales and Northern Ireland have no region, so count as one each)
+with open('./data/constituencies.json', encoding = 'utf-8') as file:
+    constituencies = json.load(file)
+regions = {}
+for const in constituencies:
+    regions.setdefault(const['region'] or const['country'], []).append(const['name'])
+with ResultsStore('./data/results_2015.jsonl') as store:
+    stored = {constituency_key(name): name for name in store.names()}
+    results = store.load(stored[constituency_key(name)] for names in regions.values() for name in names)
+
+
+## Count regions
+# Loop over regions
+seats = {}
+for region, names in regions.items():
+    region_results = [results[stored[constituency_key(name)]] for name in names]
+
+    # Run election
+    if SYSTEM == 'ams':
+        election = AdditionalMemberEngine(region_results, round(len(names) * LIST_RATIO), AMS_METHOD, THRESHOLD)
+    else:
+        candidates = [candidate for result in region_results for candidate in result.candidates]
+        election = HighestAveragesEngine(party_tallies(candidates), len(names), SYSTEM, threshold = THRESHOLD)
+    election.run_election()
+
+    # Print region result
+    allocation = {party: won for party, won in election.allocation.items() if won}
+    print('{} ({} seats): {}'.format(region, sum(allocation.values()), ', '.join(
+        '{} {}'.format(party, allocation[party]) for party in sorted(allocation, key = allocation.get, reverse = True)
+    )))
+    for party, won in allocation.items():
+        seats[party] = seats.get(party, 0) + won
+
+
+# Print seat totals
+print()
+for party in sorted(seats, key = seats.get, reverse = True):
+    print('{}: {}'.format(party, seats[party]))
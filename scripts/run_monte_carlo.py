@@ -0,0 +1,46 @@
+import json
+
+from UKVotingMethods.election_builder import constituency_key
+from UKVotingMethods.monte_carlo import RedistributionSampler, seat_distribution, simulate_seats, spread_priors
+from UKVotingMethods.records import ResultsStore
+
+
+# Settings
+SCENARIOS = 10000  # Counts run per group
+CONCENTRATION = 20  # Weight on the point estimates in data/parties.json
+SPREAD = 0.5  # Weight on every other party (and on votes leaving the count)
+SEED = None  # Set for repeatable runs
+BATCH_SIZE = 1000  # Scenarios counted at a time
+WORKERS = None  # Defaults to the number of processors
+
+
+# Main routine
+if __name__ == '__main__':
+
+    # Load settings and data
+    with open('./data/parties.json', encoding = 'utf-8') as file:
+        parties = json.load(file)
+    with open('./data/groups.json', encoding = 'utf-8') as file:
+        groups = json.load(file)
+    with ResultsStore('./data/results_2015.jsonl') as store:
+        stored = {constituency_key(name): name for name in store.names()}
+        tasks = []
+        for group in groups:
+            candidates = []
+            for const in group['constituencies']:
+                candidates.extend(store[stored[constituency_key(const)]].candidates)
+            tasks.append((candidates, len(group['constituencies'])))
+
+    # Run simulation
+    sampler = RedistributionSampler(parties, spread_priors(parties, CONCENTRATION, SPREAD), SEED)
+    labels, seats_won = simulate_seats(tasks, sampler, SCENARIOS, BATCH_SIZE, WORKERS)
+
+    # Print seat distributions
+    summary = seat_distribution(labels, seats_won)
+    for party in sorted(summary, key = lambda party: summary[party]['mean'], reverse = True):
+        print('{:<22} mean {:6.1f}  90% {:>3}-{:<3}  most seats {:6.1%}'.format(
+            party,
+            summary[party]['mean'],
+            *summary[party]['interval'],
+            summary[party]['most_seats']
+        ))
@@ -0,0 +1,72 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import json
+
+from UKVotingMethods.columnar_store import ColumnarStore
+from UKVotingMethods.election_builder import RedistributionIndex, build_election, constituency_key
+from UKVotingMethods.records import ResultsStore
+
+
+# Settings
+WORKERS = None  # Defaults to the number of processors
+CHUNK_SIZE = 4  # Groups sent to a worker at a time
+COLUMNS = None  # Columnar store to read instead of the results lines file (see scripts/build_columnar_store.py)
+YEAR = 2015  # Election to count from the columnar store
+
+
+# Single group count
+def count_group(group, candidates, redistribution):
+    """
+    This function runs the election for a single group, with one seat per constituency.
+    The group tag, quota and a list of elected (name, party) pairs are returned.
+    """
+
+    # Run election
+    election = build_election(candidates, len(group['constituencies']), redistribution)
+    election.run_election()
+    party_of = {candidate.name: candidate.party for candidate in candidates}
+    return group['tag'], election.quota, [(name, party_of[name]) for name in election.elected]
+
+
+# Chunk of group counts
+def count_chunk(chunk, redistribution):
+    """This function counts a chunk of (group, candidates) pairs in a worker process."""
+    return [count_group(group, candidates, redistribution) for group, candidates in chunk]
+
+
+# Main routine
+if __name__ == '__main__':
+
+    # Load settings and data
+    with open('./data/parties.json', encoding = 'utf-8') as file:
+        redistribution = RedistributionIndex(json.load(file))
+    with open('./data/groups.json', encoding = 'utf-8') as file:
+        groups = json.load(file)
+    store = ColumnarStore(COLUMNS).election(YEAR) if COLUMNS else ResultsStore('./data/results_2015.jsonl')
+    stored = {constituency_key(name): name for name in store.names()}
+    wanted = [stored[constituency_key(const)] for group in groups for const in group['constituencies']]
+    results = {constituency_key(name): result for name, result in store.load(wanted).items()}
+
+    # Get candidates for each group
+    tasks = []
+    for group in groups:
+        candidates = []
+        for const in group['constituencies']:
+            candidates.extend(results[constituency_key(const)].candidates)
+        tasks.append((group, candidates))
+    chunks = [tasks[i:i+CHUNK_SIZE] for i in range(0, len(tasks), CHUNK_SIZE)]
+
+    # Run elections across worker processes
+    names = {group['tag']: group['name'] for group in groups}
+    seats = {}
+    with ProcessPoolExecutor(max_workers = WORKERS) as executor:
+        futures = [executor.submit(count_chunk, chunk, redistribution) for chunk in chunks]
+        for future in as_completed(futures):
+            for tag, quota, elected in future.result():
+                print('{} (quota {}): {}'.format(names[tag], quota, ', '.join('{} ({})'.format(*member) for member in elected)))
+                for name, party in elected:
+                    seats[party] = seats.get(party, 0) + 1
+
+    # Print seat totals
+    print()
+    for party in sorted(seats, key = seats.get, reverse = True):
+        print('{}: {}'.format(party, seats[party]))
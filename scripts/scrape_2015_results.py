@@ -1,9 +1,18 @@
-from requests import get as get_request
-from bs4 import BeautifulSoup as Soup
 import json
+import os
 import sys
 
-from UKVotingMethods.wiki_scraper import get_constituency_results
+from UKVotingMethods.page_cache import PageCache
+from UKVotingMethods.records import ConstituencyResult, ResultsCheckpoint, write_results_lines
+from UKVotingMethods.wiki_scraper import fetch_page, get_constituency_pages, get_many_constituency_results, parse_page
+
+
+# Settings
+WORKERS = 8  # Pages fetched at the same time
+RATE = 10  # Requests started per second
+CACHE = PageCache('./cache')  # Local copies of downloaded pages
+PARSER = 'html.parser-tables'  # Parser backend (see scripts/benchmark_parsers.py)
+CHECKPOINT = './data/results_2015.partial.jsonl'  # Results scraped so far, for resuming after a failure
 
 
 # Get parties list
@@ -12,35 +21,24 @@ with open('./data/parties.json', encoding = 'utf-8') as file:
 
 
 # Get constituency list page
-request = get_request('https://en.wikipedia.org/wiki/Results_of_the_United_Kingdom_general_election,_2015_by_parliamentary_constituency')
-request.raise_for_status()
-soup = Soup(request.text, 'html.parser')
-
-
-# Loop over table rows
-constituencies = {}
-table = soup.find('table', class_='wikitable')
-for row in table.findChildren('tr'):
-    
-    # Skip header row
-    if row.get('valign'):
-        continue
-    
-    # Skip bottom rows
-    if row.get('class'):
-        continue
-    
-    # Get constituency
-    constituency_anchor = row.findChild('td').findChild('a')
-    name = str(constituency_anchor.contents[0])
-    
-    # Get results
-    print('({:03}/650) {}'.format(len(constituencies)+1, name))
-    page_url = 'https://en.wikipedia.org' + constituency_anchor.get('href')
-    constituencies[name] = get_constituency_results(page_url, 2015, parties)
-
-
-# Write data to file
+page = fetch_page('https://en.wikipedia.org/wiki/Results_of_the_United_Kingdom_general_election,_2015_by_parliamentary_constituency', cache = CACHE)
+pages = get_constituency_pages(parse_page(page, PARSER))
+
+
+# Get results, skipping constituencies already in the checkpoint
+with ResultsCheckpoint(CHECKPOINT) as checkpoint:
+    if len(checkpoint):
+        print('Resuming with {} constituencies already scraped'.format(len(checkpoint)))
+    remaining = [page_url for page_url in pages if pages[page_url] not in checkpoint]
+    for page_url, candidates in get_many_constituency_results(remaining, 2015, parties, workers = WORKERS, rate = RATE, cache = CACHE, parser = PARSER):
+        print('({:03}/{}) {}'.format(len(checkpoint)+1, len(pages), pages[page_url]))
+        checkpoint.append(ConstituencyResult(pages[page_url], candidates))
+    results = checkpoint.results
+
+
+# Write data to file, in list page order
+constituencies = {name: results[name].to_list() for name in pages.values()}
 with open('./data/results_2015.json', 'w+') as file:
     json.dump(constituencies, file)
-
+write_results_lines({name: results[name] for name in pages.values()}, './data/results_2015.jsonl')
+os.remove(CHECKPOINT)
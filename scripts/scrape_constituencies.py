@@ -1,8 +1,10 @@
-from requests import get as get_request
 from bs4 import BeautifulSoup as Soup
 import json
 import re
 
+from UKVotingMethods.page_cache import PageCache
+from UKVotingMethods.wiki_scraper import fetch_page
+
 
 # Get constituency group list
 with open('./data/groups.json') as file:
@@ -10,9 +12,8 @@ with open('./data/groups.json') as file:
 
 
 # Get constituency list
-request = get_request('https://en.wikipedia.org/wiki/List_of_United_Kingdom_Parliament_constituencies')
-request.raise_for_status()
-soup = Soup(request.text, 'html.parser')
+page = fetch_page('https://en.wikipedia.org/wiki/List_of_United_Kingdom_Parliament_constituencies', cache = PageCache('./cache'))
+soup = Soup(page, 'html.parser')
 table = soup.find('table', class_='wikitable sortable')
 constituencies = []
 for row in table.findChildren('tr'):
@@ -0,0 +1,52 @@
+from time import perf_counter
+import json
+
+from UKVotingMethods.ballot_engines import BallotElectionEngine, ballots_from_matrix
+from UKVotingMethods.election_builder import RedistributionIndex, build_election, constituency_key
+from UKVotingMethods.records import ResultsStore
+
+
+# Load settings and data
+with open('./data/parties.json', encoding = 'utf-8') as file:
+    redistribution = RedistributionIndex(json.load(file))
+with open('./data/groups.json', encoding = 'utf-8') as file:
+    groups = json.load(file)
+with ResultsStore('./data/results_2015.jsonl') as store:
+    stored = {constituency_key(name): name for name in store.names()}
+    results = store.load(stored[constituency_key(const)] for group in groups for const in group['constituencies'])
+
+
+## Compare ballot and matrix counts
+# Loop over voting groups
+differences = 0
+ballot_count = 0
+timings = {'matrix': 0, 'ballots': 0}
+for group in groups:
+    candidates = []
+    for const in group['constituencies']:
+        candidates.extend(results[stored[constituency_key(const)]].candidates)
+    seats = len(group['constituencies'])
+
+    # Count from the redistribution matrix
+    start = perf_counter()
+    election = build_election(candidates, seats, redistribution)
+    election.run_election()
+    timings['matrix'] += perf_counter() - start
+
+    # Count from synthetic ballots expressing the same matrix
+    start = perf_counter()
+    ballots = ballots_from_matrix(election.votes[0], election.redistribution_matrix)
+    ballot_election = BallotElectionEngine(list(election.votes[0]), seats, ballots)
+    ballot_election.run_election()
+    timings['ballots'] += perf_counter() - start
+    ballot_count += len(ballots)
+
+    # Compare elected candidates
+    if sorted(election.elected) != sorted(ballot_election.elected):
+        differences += 1
+        print('{}: matrix {} / ballots {}'.format(group['name'], sorted(election.elected), sorted(ballot_election.elected)))
+
+
+# Print summary
+print('Groups: {}  differing: {}  distinct synthetic ballots: {}'.format(len(groups), differences, ballot_count))
+print('Matrix count {:.2f}s  ballot count (including ballot generation) {:.2f}s'.format(timings['matrix'], timings['ballots']))